@@ -2,6 +2,7 @@ import numpy as np
 import random
 import logging
 import json
+import orjson
 import uuid
 import os
 import sys
@@ -49,6 +50,9 @@ class ComprehensivePersistentMemory:
             'contextual_memories': {}
         }
         
+        # Last serialized form of each component, to skip unchanged rewrites
+        self._saved_snapshots: Dict[str, bytes] = {}
+        
         # Load existing memory
         self._load_memory()
         
@@ -79,9 +83,11 @@ class ComprehensivePersistentMemory:
             for filename in memory_files:
                 filepath = os.path.join(self.base_dir, filename)
                 if os.path.exists(filepath):
-                    with open(filepath, 'r') as f:
+                    with open(filepath, 'rb') as f:
                         key = filename.replace('.json', '')
-                        self._memory[key] = json.load(f)
+                        raw = f.read()
+                        self._memory[key] = orjson.loads(raw)
+                        self._saved_snapshots[key] = raw
         except Exception as e:
             logging.error(f"Error loading memory: {e}")
     
@@ -100,9 +106,14 @@ class ComprehensivePersistentMemory:
         with self._memory_lock:
             try:
                 for key, data in self._memory.items():
+                    serialized = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+                    if self._saved_snapshots.get(key) == serialized:
+                        continue
+                    
                     filepath = os.path.join(self.base_dir, f'{key}.json')
-                    with open(filepath, 'w') as f:
-                        json.dump(data, f, indent=4)
+                    with open(filepath, 'wb') as f:
+                        f.write(serialized)
+                    self._saved_snapshots[key] = serialized
             except Exception as e:
                 logging.error(f"Error saving memory: {e}")
     
@@ -443,6 +454,7 @@ class PersistentStorageManager:
         self._storage_file = storage_file
         self._sync_interval = sync_interval
         self._storage_lock = threading.Lock()
+        self._saved_snapshot: Optional[bytes] = None
         self._data: Dict[str, Any] = self._load_storage()
         
         # Start background synchronization thread
@@ -461,8 +473,9 @@ class PersistentStorageManager:
         """
         try:
             if os.path.exists(self._storage_file):
-                with open(self._storage_file, 'r') as f:
-                    return json.load(f)
+                with open(self._storage_file, 'rb') as f:
+                    self._saved_snapshot = f.read()
+                return orjson.loads(self._saved_snapshot)
             return {}
         except Exception as e:
             logging.error(f"Error loading storage: {e}")
@@ -474,8 +487,13 @@ class PersistentStorageManager:
         """
         try:
             with self._storage_lock:
-                with open(self._storage_file, 'w') as f:
-                    json.dump(self._data, f, indent=4)
+                serialized = orjson.dumps(self._data, option=orjson.OPT_NON_STR_KEYS)
+                if serialized == self._saved_snapshot:
+                    return
+                
+                with open(self._storage_file, 'wb') as f:
+                    f.write(serialized)
+                self._saved_snapshot = serialized
         except Exception as e:
             logging.error(f"Error saving storage: {e}")
     
@@ -1,12 +1,12 @@
 import asyncio
-import json
+import orjson
 import logging
 from typing import List, Dict, Any
 import numpy as np
 import tensorflow as tf
 from datetime import datetime
 
-from web_search import AdvancedWebSearcher
+from web_search import AdvancedWebSearcher, SearchResult
 
 class ChainOfThoughtsSystem:
     def __init__(self, max_reasoning_steps=10, ai_caller=None):
@@ -67,7 +67,7 @@ class ChainOfThoughtsSystem:
         
         for step in range(self.max_reasoning_steps):
             # Step 1: Web Search for Context
-            web_results = self.web_searcher.web_search(current_context, max_results=10)
+            web_results = await self.web_searcher.web_search(current_context, max_results=10)
             
             # Step 2: Extract Key Information
             key_insights = self._extract_key_insights(web_results)
@@ -98,19 +98,19 @@ class ChainOfThoughtsSystem:
             "total_steps": len(self.reasoning_history)
         }
     
-    def _extract_key_insights(self, web_results: List[Dict]) -> List[str]:
+    def _extract_key_insights(self, web_results: List[SearchResult]) -> List[str]:
         """
         Extract key insights from web search results
         
         Args:
-            web_results (List[Dict]): Web search results
+            web_results (List[SearchResult]): Web search results
         
         Returns:
             List of key insights
         """
         insights = []
         for result in web_results:
-            insights.append(result.get('snippet', ''))
+            insights.append(result.snippet)
         return insights[:3]  # Limit to top 3 insights
     
     async def _perform_reasoning_step(self, context: str, insights: List[str]) -> Dict:
@@ -211,11 +211,11 @@ class ChainOfThoughtsSystem:
             filename (str): File to save reasoning trace
         """
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump({
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps({
                     "reasoning_history": self.reasoning_history,
                     "timestamp": str(datetime.now())
-                }, f, ensure_ascii=False, indent=2)
+                }, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
             self.logger.info(f"Reasoning trace saved to {filename}")
         except Exception as e:
             self.logger.error(f"Error saving reasoning trace: {e}")
@@ -1,5 +1,5 @@
 import os
-import json
+import orjson
 import time
 import asyncio
 import logging
@@ -9,13 +9,19 @@ from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from groq import Groq
 from dotenv import load_dotenv
-import glob
+from concurrent.futures import ThreadPoolExecutor
+import bisect
+import heapq
+import itertools
 import colorama
 from colorama import Fore, Style
 
 # Initialize colorama for colored console output
 colorama.init(autoreset=True)
 
+# Worker threads used to read memory files in parallel
+MEMORY_READ_WORKERS = 32
+
 class MemoryChunk:
     def __init__(self, content: str, timestamp: float = None, category: str = 'default'):
         self.id = str(uuid.uuid4())  # Unique identifier for each chunk
@@ -89,22 +95,19 @@ class UserMemoryManager:
     
     def split_memory_content(self, content: str, max_chunk_size: int = 4000) -> List[MemoryChunk]:
         """Split memory content into manageable chunks for Groq AI"""
-        chunks = []
         words = content.split()
-        current_chunk = []
-        current_chunk_size = 0
-        
-        for word in words:
-            if current_chunk_size + len(word) > max_chunk_size:
-                chunks.append(MemoryChunk(' '.join(current_chunk)))
-                current_chunk = []
-                current_chunk_size = 0
-            
-            current_chunk.append(word)
-            current_chunk_size += len(word) + 1  # +1 for space
         
-        if current_chunk:
-            chunks.append(MemoryChunk(' '.join(current_chunk)))
+        # Running offsets of each word in the space-joined text; chunk boundaries
+        # are found by bisecting these instead of appending word by word
+        offsets = [0, *itertools.accumulate(len(word) + 1 for word in words)]
+        
+        chunks = []
+        start = 0
+        while start < len(words):
+            end = bisect.bisect_right(offsets, offsets[start] + max_chunk_size + 1, lo=start + 1) - 1
+            end = max(end, start + 1)  # Always take at least one word
+            chunks.append(MemoryChunk(' '.join(words[start:end])))
+            start = end
         
         return chunks
     
@@ -207,14 +210,17 @@ class UserMemoryManager:
             pruned_chunks.append(chunk)
             freed_space += chunk.size
         
-        # Remove pruned chunks
-        for chunk in pruned_chunks:
-            self.user_memories[user_id].remove(chunk)
-            
-            # Clean up index
-            for category, chunk_ids in self.memory_index[user_id].items():
-                if chunk.id in chunk_ids:
-                    chunk_ids.remove(chunk.id)
+        # Remove pruned chunks and their index entries in one pass each,
+        # rather than a list.remove() scan per pruned chunk
+        pruned_ids = {chunk.id for chunk in pruned_chunks}
+        self.user_memories[user_id] = [
+            chunk for chunk in self.user_memories[user_id]
+            if chunk.id not in pruned_ids
+        ]
+        
+        # Clean up index
+        for category, chunk_ids in self.memory_index.get(user_id, {}).items():
+            chunk_ids[:] = [chunk_id for chunk_id in chunk_ids if chunk_id not in pruned_ids]
         
         logging.info(f"Pruned {len(pruned_chunks)} memory chunks for user {user_id}")
 
@@ -233,23 +239,15 @@ class UserMemoryManager:
         
         chunks = self.user_memories[user_id]
         
-        # Apply filters
-        if category:
-            chunks = [
-                chunk for chunk in chunks 
-                if chunk.category == category
-            ]
-        
-        if min_timestamp:
-            chunks = [
-                chunk for chunk in chunks 
-                if chunk.timestamp >= min_timestamp
-            ]
-        
-        # Sort by timestamp, most recent first
-        chunks.sort(key=lambda x: x.timestamp, reverse=True)
+        # Apply filters lazily in a single pass
+        matching = (
+            chunk for chunk in chunks
+            if (not category or chunk.category == category)
+            and (not min_timestamp or chunk.timestamp >= min_timestamp)
+        )
         
-        return chunks[:max_chunks]
+        # Most recent first, without sorting the whole (or the stored) list
+        return heapq.nlargest(max_chunks, matching, key=lambda x: x.timestamp)
 
     def save_memory_state(self):
         """Save entire memory state to persistent storage"""
@@ -269,21 +267,31 @@ class UserMemoryManager:
                 } for chunk in chunks
             ]
             
-            with open(user_memory_file, 'w', encoding='utf-8') as f:
-                json.dump(serialized_chunks, f, ensure_ascii=False, indent=2)
+            with open(user_memory_file, 'wb') as f:
+                f.write(orjson.dumps(serialized_chunks))
         
         logging.info("Memory state saved successfully")
 
     def load_memory_state(self):
         """Load memory state from persistent storage"""
-        for filename in os.listdir(self.storage_dir):
-            if filename.endswith('_memory_state.json'):
+        state_files = [
+            filename for filename in os.listdir(self.storage_dir)
+            if filename.endswith('_memory_state.json')
+        ]
+        
+        def load_state_file(filename):
+            with open(os.path.join(self.storage_dir, filename), 'rb') as f:
+                return orjson.loads(f.read())
+        
+        # File reads release the GIL, so a thread pool overlaps the I/O
+        with ThreadPoolExecutor(max_workers=MEMORY_READ_WORKERS) as executor:
+            futures = [executor.submit(load_state_file, filename) for filename in state_files]
+            
+            for filename, future in zip(state_files, futures):
                 user_id = filename.split('_')[0]
-                file_path = os.path.join(self.storage_dir, filename)
                 
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        serialized_chunks = json.load(f)
+                    serialized_chunks = future.result()
                     
                     self.user_memories[user_id] = [
                         MemoryChunk(
@@ -321,8 +329,8 @@ class UserMemoryManager:
                     file_path (str): Path to the memory JSON file
                 """
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        memories = json.load(f)
+                    with open(file_path, 'rb') as f:
+                        memories = orjson.loads(f.read())
                     
                     # Asynchronously send memories to Groq
                     asyncio.create_task(self.memory_manager.send_memories_to_groq(memories))
@@ -352,20 +360,30 @@ class UserMemoryManager:
         Returns:
             List of memory contents from all JSON files
         """
-        memory_files = glob.glob(os.path.join(self.memory_dir, '*.json'))
+        with os.scandir(self.memory_dir) as entries:
+            memory_files = [
+                entry.path for entry in entries
+                if entry.name.endswith('.json') and not entry.name.startswith('.') and entry.is_file()
+            ]
         all_memories = []
         
         print(f"{Fore.CYAN}🔍 Scanning memory files...{Style.RESET_ALL}")
         
-        for file_path in memory_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    file_memories = json.load(f)
-                    all_memories.extend(file_memories)
-                
-                print(f"{Fore.GREEN}✓ Processed memory file: {os.path.basename(file_path)}{Style.RESET_ALL}")
-            except Exception as e:
-                print(f"{Fore.RED}✗ Error processing {file_path}: {e}{Style.RESET_ALL}")
+        def load_memory_file(file_path):
+            with open(file_path, 'rb') as f:
+                return orjson.loads(f.read())
+        
+        # File reads release the GIL, so a thread pool overlaps the I/O
+        with ThreadPoolExecutor(max_workers=MEMORY_READ_WORKERS) as executor:
+            futures = [executor.submit(load_memory_file, file_path) for file_path in memory_files]
+            
+            for file_path, future in zip(memory_files, futures):
+                try:
+                    all_memories.extend(future.result())
+                    
+                    print(f"{Fore.GREEN}✓ Processed memory file: {os.path.basename(file_path)}{Style.RESET_ALL}")
+                except Exception as e:
+                    print(f"{Fore.RED}✗ Error processing {file_path}: {e}{Style.RESET_ALL}")
         
         return all_memories
     
@@ -381,15 +399,21 @@ class UserMemoryManager:
             return
         
         try:
-            # Prepare memory context for Groq
-            memory_context = "\n".join([
-                f"[{mem.get('role', 'unknown')}]: {mem.get('content', '')}" 
-                for mem in memories
-            ])
+            max_context_length = 4000  # Adjust based on Groq's token limits
+            
+            # Prepare memory context for Groq from the newest memories backwards,
+            # formatting only as many as fit instead of joining the whole corpus
+            context_lines = []
+            context_length = -1  # No separator before the first line
+            for mem in reversed(memories):
+                line = f"[{mem.get('role', 'unknown')}]: {mem.get('content', '')}"
+                context_lines.append(line)
+                context_length += len(line) + 1
+                if context_length >= max_context_length:
+                    break
             
             # Truncate memory context if too long
-            max_context_length = 4000  # Adjust based on Groq's token limits
-            memory_context = memory_context[-max_context_length:]
+            memory_context = "\n".join(reversed(context_lines))[-max_context_length:]
             
             print(f"{Fore.CYAN}📤 Sending memory context to Groq API...{Style.RESET_ALL}")
             
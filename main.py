@@ -11,8 +11,10 @@ warnings.filterwarnings('ignore', message='Cannot modify interface*')
 import os
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'  # Suppress TensorFlow warnings
 import sys
-import threading
-import time
+import functools
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import discord
 from discord.ext import tasks
@@ -27,8 +29,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from web_search import AdvancedWebSearcher
 
 # Import custom modules
-from memory_manager import memory_manager
-from self_reward_learner import self_reward_learner
+from memory_manager import memory_manager, start_periodic_processing
+from self_reward_learner import get_learner
 from chain_of_thoughts import ChainOfThoughtsSystem
 
 # Load environment variables
@@ -40,9 +42,11 @@ GROQ_API_KEY = os.getenv('GROQ_API_KEY')
 MEMORY_DIR = "memory"
 DNS_SERVERS = change_dns.DNS_SERVERS
 
+# Seconds between periodic system state updates
+SYSTEM_UPDATE_INTERVAL = 300
+
 # Ensure memory directory exists
-if not os.path.exists(MEMORY_DIR):
-    os.makedirs(MEMORY_DIR)
+os.makedirs(MEMORY_DIR, exist_ok=True)
 
 intents = discord.Intents.default()
 intents.messages = True
@@ -131,14 +135,14 @@ class DeepSelfRewardSystem:
         conversation_id = memory_manager.record_conversation(user_message, bot_response)
         
         # Calculate and record reward
-        reward = self_reward_learner.calculate_reward({
+        reward = get_learner().calculate_reward({
             'user_message': user_message,
             'bot_response': bot_response
         })
         memory_manager.record_reward(conversation_id, reward)
         
         # Train on the interaction
-        self_reward_learner.train_on_conversation({
+        get_learner().train_on_conversation({
             'user_message': user_message,
             'bot_response': bot_response
         }, target_reward=reward)
@@ -158,22 +162,49 @@ class DeepSelfRewardSystem:
         # Basic response generation - replace with more advanced method
         return f"I received your message: {user_message}. I'm learning and evolving!"
     
+    def _system_update_tick(self):
+        """Record activity and give the learner a chance to evolve"""
+        # Periodic system state updates
+        memory_manager.update_system_state('last_active', datetime.now().isoformat())
+        
+        # Optional: Trigger model evolution
+        get_learner().evolve_model()
+    
+    async def _periodic_system_update(self):
+        """Run system updates on the event loop, resuming the persisted schedule"""
+        # Wait out the remainder of the interval left over from a previous run
+        last_active = memory_manager.system_state.get('last_active')
+        if last_active:
+            elapsed = (datetime.now() - datetime.fromisoformat(last_active)).total_seconds()
+            await asyncio.sleep(max(0, SYSTEM_UPDATE_INTERVAL - elapsed))
+        
+        while True:
+            try:
+                # Blocking work (disk writes, learner start-up) stays off the event loop
+                await asyncio.to_thread(self._system_update_tick)
+            except Exception as e:
+                logging.error(f"Error in periodic system update: {e}")
+            
+            await asyncio.sleep(SYSTEM_UPDATE_INTERVAL)
+    
     def start_background_tasks(self):
         """Start various background tasks for continuous learning and maintenance"""
-        def periodic_system_update():
-            while True:
-                # Periodic system state updates
-                memory_manager.update_system_state('last_active', datetime.now().isoformat())
-                
-                # Optional: Trigger model evolution
-                self_reward_learner.evolve_model()
-                
-                # Sleep for a while before next update
-                time.sleep(300)  # Every 5 minutes
+        # Scheduled on the running event loop rather than a dedicated thread
+        loop = asyncio.get_running_loop()
+        self._update_task = loop.create_task(self._periodic_system_update())
         
-        # Start background update thread
-        update_thread = threading.Thread(target=periodic_system_update, daemon=True)
-        update_thread.start()
+        # Import TensorFlow and build the learner's model off the event loop
+        self._learner_task = loop.create_task(asyncio.to_thread(get_learner))
+
+try:
+    from rapidfuzz import fuzz, process, utils as fuzz_utils
+except ImportError:
+    fuzz = None
+
+@functools.lru_cache(maxsize=4096)
+def _word_set(text):
+    """Lowercased word set of a message, cached across similarity comparisons"""
+    return frozenset(text.lower().split())
 
 class TopicTracker:
     def __init__(self, max_context_length=10, similarity_threshold=0.7):
@@ -212,36 +243,48 @@ class TopicTracker:
             self.nlp = None
             self.sentence_transformer = None
     
-    def _compute_semantic_similarity(self, text1, text2):
+    def _basic_similarity(self, text1, text2):
         """
-        Compute advanced semantic similarity between two texts
+        Basic text similarity using token-set matching, or word overlap
+        when rapidfuzz is not available
         
         Returns:
             float: Similarity score between 0 and 1
         """
-        if self.sentence_transformer:
-            # Use sentence transformer for advanced semantic similarity
-            embeddings = self.sentence_transformer.encode([text1, text2])
-            similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
-            return similarity
+        if fuzz is not None:
+            return fuzz.token_set_ratio(text1, text2, processor=fuzz_utils.default_process) / 100.0
+        
+        words1 = _word_set(text1)
+        words2 = _word_set(text2)
         
-        # Fallback to basic similarity if advanced libraries not available
-        return self._basic_similarity(text1, text2)
+        intersection = len(words1 & words2)
+        union = len(words1) + len(words2) - intersection
+        
+        return intersection / union if union > 0 else 0
     
-    def _basic_similarity(self, text1, text2):
+    def _compute_similarities(self, text, other_texts):
         """
-        Basic text similarity using word overlap
+        Compute similarity between one text and each of several others
+        
+        The shared text is embedded once, in the same batch as the others.
         
         Returns:
-            float: Similarity score between 0 and 1
+            list: Similarity scores between 0 and 1, in the order of other_texts
         """
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
+        if not other_texts:
+            return []
+        
+        if self.sentence_transformer:
+            embeddings = self.sentence_transformer.encode([text] + list(other_texts))
+            return list(cosine_similarity([embeddings[0]], embeddings[1:])[0])
         
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
+        if fuzz is not None:
+            # Score against all previous texts in a single native call
+            scores = process.cdist([text], list(other_texts), scorer=fuzz.token_set_ratio,
+                                   processor=fuzz_utils.default_process)
+            return list(scores[0] / 100.0)
         
-        return intersection / union if union > 0 else 0
+        return [self._basic_similarity(text, other) for other in other_texts]
     
     def _extract_topic_keywords(self, text):
         """
@@ -273,12 +316,9 @@ class TopicTracker:
         Returns:
             dict: Topic tracking information
         """
+        # Bounded context: appending past max_context_length evicts the oldest message
         if user_id not in self.conversation_context:
-            self.conversation_context[user_id] = []
-        
-        # Manage context length
-        if len(self.conversation_context[user_id]) >= self.max_context_length:
-            self.conversation_context[user_id].pop(0)
+            self.conversation_context[user_id] = deque(maxlen=self.max_context_length)
         
         # Extract current message keywords
         current_keywords = self._extract_topic_keywords(message)
@@ -287,9 +327,11 @@ class TopicTracker:
         topic_continuity_score = 0
         related_previous_messages = []
         
-        for prev_message in reversed(self.conversation_context[user_id]):
-            similarity = self._compute_semantic_similarity(message, prev_message)
-            
+        # Only the messages that remain once the current one is appended
+        previous_messages = list(reversed(self.conversation_context[user_id]))[:self.max_context_length - 1]
+        similarities = self._compute_similarities(message, previous_messages)
+        
+        for prev_message, similarity in zip(previous_messages, similarities):
             if similarity >= self.similarity_threshold:
                 topic_continuity_score += similarity
                 related_previous_messages.append(prev_message)
@@ -338,13 +380,19 @@ class TopicTracker:
 try:
     from sklearn.metrics.pairwise import cosine_similarity
 except ImportError:
+    import numpy as np
+    
     def cosine_similarity(X, Y):
         """Basic cosine similarity implementation if sklearn is not available"""
-        import numpy as np
         def _cosine_similarity(x, y):
             return np.dot(x, y) / (np.linalg.norm(x) * np.linalg.norm(y))
         return [[_cosine_similarity(x, y) for y in Y] for x in X]
 
+try:
+    from textblob import TextBlob
+except ImportError:
+    TextBlob = None
+
 class PromptEngineeringSystem:
     def __init__(self, 
                  context_depth=5, 
@@ -423,20 +471,19 @@ class PromptEngineeringSystem:
         Returns:
             dict: Sentiment scores and interpretation
         """
-        try:
-            from textblob import TextBlob
-            blob = TextBlob(text)
-            return {
-                'polarity': blob.sentiment.polarity,
-                'subjectivity': blob.sentiment.subjectivity,
-                'interpretation': (
-                    'Positive' if blob.sentiment.polarity > 0.2 else
-                    'Negative' if blob.sentiment.polarity < -0.2 else
-                    'Neutral'
-                )
-            }
-        except ImportError:
+        if TextBlob is None:
             return {'sentiment': 'unavailable'}
+        
+        blob = TextBlob(text)
+        return {
+            'polarity': blob.sentiment.polarity,
+            'subjectivity': blob.sentiment.subjectivity,
+            'interpretation': (
+                'Positive' if blob.sentiment.polarity > 0.2 else
+                'Negative' if blob.sentiment.polarity < -0.2 else
+                'Neutral'
+            )
+        }
     
     def _compute_text_complexity(self, text):
         """
@@ -500,18 +547,14 @@ class PromptEngineeringSystem:
         
         # Manage conversation context
         if user_id not in self.context_memory:
-            self.context_memory[user_id] = []
+            self.context_memory[user_id] = deque(maxlen=self.context_depth)
         
-        # Update context memory
+        # Update context memory, evicting the oldest entry beyond context_depth
         self.context_memory[user_id].append({
             'message': message,
             'features': semantic_features
         })
         
-        # Trim context memory
-        if len(self.context_memory[user_id]) > self.context_depth:
-            self.context_memory[user_id].pop(0)
-        
         # Dynamic prompt generation
         prompt_template = self._generate_prompt_template(
             semantic_features, 
@@ -527,7 +570,7 @@ class PromptEngineeringSystem:
             'base_message': message,
             'semantic_features': semantic_features,
             'prompt_template': prompt_template,
-            'context_history': self.context_memory[user_id]
+            'context_history': list(self.context_memory[user_id])
         }
     
     def _generate_prompt_template(self, 
@@ -752,6 +795,9 @@ class DiscordBot:
         # Initialize Groq API integration
         self.groq_api_key = GROQ_API_KEY
         
+        # Shared HTTP session for Groq API calls, created on first use
+        self._http_session = None
+        
         # Initialize AdvancedWebSearcher
         self.web_searcher = AdvancedWebSearcher(
             log_file='discord_web_search.log', 
@@ -786,8 +832,11 @@ class DiscordBot:
         )
 
     def load_memory(self):
-        for user_id in memory_manager.get_user_ids():
-            self.user_memory[user_id] = memory_manager.load_user_memory(user_id)
+        # Per-user files are independent, so read them on a thread pool
+        user_ids = memory_manager.get_user_ids()
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            for user_id, user_memory in zip(user_ids, executor.map(memory_manager.load_user_memory, user_ids)):
+                self.user_memory[user_id] = user_memory
 
     def save_memory(self, user_id):
         memory_manager.save_user_memory(user_id, self.user_memory[user_id])
@@ -818,7 +867,7 @@ class DiscordBot:
         while retry_count < max_retries:
             try:
                 # Use AdvancedWebSearcher to perform search
-                results = self.web_searcher.web_search(query, max_results=300)
+                results = await self.web_searcher.web_search(query, max_results=300)
                 
                 if results and len(results) > 0:
                     # Format multiple search results
@@ -826,9 +875,9 @@ class DiscordBot:
                     for i, result in enumerate(results, 300):
                         search_response += (
                             f"**Result {i}**:\n"
-                            f"📌 Title: {result.get('title', 'N/A')}\n"
-                            f"🔗 Link: {result.get('link', 'N/A')}\n"
-                            f"📝 Snippet: {result.get('snippet', 'No snippet available')}\n\n"
+                            f"📌 Title: {result.title or 'N/A'}\n"
+                            f"🔗 Link: {result.link or 'N/A'}\n"
+                            f"📝 Snippet: {result.snippet or 'No snippet available'}\n\n"
                         )
                     
                     # Add a footer with total results
@@ -884,7 +933,7 @@ class DiscordBot:
                 # Perform automatic web search to enhance context
                 try:
                     # Attempt to get web search results
-                    web_search_results = self.web_searcher.web_search(user_message_str, max_results=10)
+                    web_search_results = await self.web_searcher.web_search(user_message_str, max_results=10)
                     
                     # If web search results are found, add them to the context
                     if web_search_results and len(web_search_results) > 0:
@@ -893,8 +942,8 @@ class DiscordBot:
                         for i, result in enumerate(web_search_results, 1):
                             web_context += (
                                 f"Kaynak {i}:\n"
-                                f"Başlık: {result.get('title', 'N/A')}\n"
-                                f"Özet: {result.get('snippet', 'Detay yok')}\n\n"
+                                f"Başlık: {result.title or 'N/A'}\n"
+                                f"Özet: {result.snippet or 'Detay yok'}\n\n"
                             )
                         
                         # Add web search results to memory as context
@@ -1008,8 +1057,9 @@ REMEMBER: You are not just an AI, but a unique conversational partner with your
                 self.user_memory[user_id] = memory
                 self.save_memory(user_id)
 
-                # Process interaction with Deep Self-Reward Learning System
-                self.deep_self_reward_system.process_interaction(str(user_message), response)
+                # Process interaction with Deep Self-Reward Learning System; reward
+                # prediction and training block, so they run on a worker thread
+                await asyncio.to_thread(self.deep_self_reward_system.process_interaction, str(user_message), response)
 
                 # Optional: Save reasoning trace
                 self.chain_of_thoughts.save_reasoning_trace(f'reasoning_trace_{user_id}.json')
@@ -1023,7 +1073,6 @@ REMEMBER: You are not just an AI, but a unique conversational partner with your
             except BaseException as e:
                 print(f"Error in generate_response: {e}")
                 # Log the full traceback for debugging
-                import traceback
                 traceback.print_exc()
                 return "Sorry, I'm having trouble generating a response right now. 🤖❌"
         
@@ -1038,65 +1087,74 @@ REMEMBER: You are not just an AI, but a unique conversational partner with your
             print(f"Outer exception in generate_response: {e}")
             return "An unexpected error occurred. 🤖❌"
 
+    def _get_http_session(self):
+        """Return the shared aiohttp session, keeping connections to the Groq API alive"""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(headers={
+                "Authorization": f"Bearer {self.groq_api_key}",
+                "Content-Type": "application/json"
+            })
+        return self._http_session
+
+    async def close(self):
+        """Close the shared Groq API session"""
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+
     async def call_groq_ai(self, prompt):
         max_retries = 100  # Increased to 100 attempts
         base_delay = 1  # Initial delay in seconds
         
         for attempt in range(max_retries):
             try:
-                async with aiohttp.ClientSession() as session:
-                    headers = {
-                        "Authorization": f"Bearer {self.groq_api_key}",
-                        "Content-Type": "application/json"
-                    }
-                    payload = {
-                        "model": "llama-3.3-70b-versatile",
-                        "messages": [
-                            {
-                                "role": "system", 
-                                "content": "You are a helpful Protogen AI assistant. Always respond concisely and directly. " 
-                                           "Limit your responses to 2000 characters or less. " 
-                                           "Be clear, informative, and avoid unnecessary elaboration."
-                                           "Speak the language of the user."
-                                           "Do what user desire and do not ask it"
-                            },
-                            {"role": "user", "content": prompt}
-                        ],
-                        "max_tokens": 32768,
-                        "temperature": 0.7,
-                        "top_p": 0.9
-                    }
-                    
-                    # Add timeout to prevent hanging
-                    async with session.post(
-                        "https://api.groq.com/openai/v1/chat/completions", 
-                        headers=headers, 
-                        json=payload,
-                        timeout=10  # 10-second timeout
-                    ) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            response = data['choices'][0]['message']['content'].strip()
-                            
-                            # Additional safeguard to ensure response is within 2000 characters
-                            return response[:2000]
-                        elif resp.status == 429:
-                            # Rate limit error - prepare for retry
-                            error_data = await resp.json()
-                            retry_after = float(error_data.get('error', {}).get('message', '').split('in ')[-1].split('s.')[0])
-                            
-                            # Use exponential backoff with jitter
-                            delay = min(base_delay * (2 ** min(attempt, 10)) + random.uniform(0, 1), retry_after)
-                            print(f"Rate limit hit. Retrying in {delay} seconds (Attempt {attempt + 1}/{max_retries})")
-                            await asyncio.sleep(delay)
-                            continue
-                        else:
-                            error_text = await resp.text()
-                            print(f"Groq API Error: {resp.status} - {error_text}")
-                            # Wait a bit before next retry
-                            await asyncio.sleep(base_delay * (2 ** min(attempt, 10)))
-                            continue
-        
+                session = self._get_http_session()
+                payload = {
+                    "model": "llama-3.3-70b-versatile",
+                    "messages": [
+                        {
+                            "role": "system", 
+                            "content": "You are a helpful Protogen AI assistant. Always respond concisely and directly. " 
+                                       "Limit your responses to 2000 characters or less. " 
+                                       "Be clear, informative, and avoid unnecessary elaboration."
+                                       "Speak the language of the user."
+                                       "Do what user desire and do not ask it"
+                        },
+                        {"role": "user", "content": prompt}
+                    ],
+                    "max_tokens": 32768,
+                    "temperature": 0.7,
+                    "top_p": 0.9
+                }
+                
+                # Add timeout to prevent hanging
+                async with session.post(
+                    "https://api.groq.com/openai/v1/chat/completions", 
+                    json=payload,
+                    timeout=10  # 10-second timeout
+                ) as resp:
+                    if resp.status == 200:
+                        data = await resp.json()
+                        response = data['choices'][0]['message']['content'].strip()
+                        
+                        # Additional safeguard to ensure response is within 2000 characters
+                        return response[:2000]
+                    elif resp.status == 429:
+                        # Rate limit error - prepare for retry
+                        error_data = await resp.json()
+                        retry_after = float(error_data.get('error', {}).get('message', '').split('in ')[-1].split('s.')[0])
+                        
+                        # Use exponential backoff with jitter
+                        delay = min(base_delay * (2 ** min(attempt, 10)) + random.uniform(0, 1), retry_after)
+                        print(f"Rate limit hit. Retrying in {delay} seconds (Attempt {attempt + 1}/{max_retries})")
+                        await asyncio.sleep(delay)
+                        continue
+                    else:
+                        error_text = await resp.text()
+                        print(f"Groq API Error: {resp.status} - {error_text}")
+                        # Wait a bit before next retry
+                        await asyncio.sleep(base_delay * (2 ** min(attempt, 10)))
+                        continue
+    
             except aiohttp.ClientConnectionError:
                 print("Network error: Unable to connect to Groq API")
                 await asyncio.sleep(base_delay * (2 ** min(attempt, 10)))
@@ -1147,11 +1205,17 @@ REMEMBER: You are not just an AI, but a unique conversational partner with your
             # Send the chunk
             await channel.send(chunk)
 
+# Created once the client is ready
+bot = None
+
 @client.event
 async def on_ready():
     print(f'Logged in as {client.user} (ID: {client.user.id})')
     print('------')
     global bot
+    # on_ready fires again after a reconnect; release the previous session
+    if bot is not None:
+        await bot.close()
     bot = DiscordBot(client)
     bot.start()  # Start background tasks
 
@@ -1189,9 +1253,20 @@ async def on_member_join(member):
     # Welcome new members if needed
     pass
 
+async def run_client():
+    """Run the Discord client, closing the bot's HTTP session on shutdown"""
+    try:
+        await client.start(DISCORD_TOKEN)
+    finally:
+        if bot is not None:
+            await bot.close()
+        if not client.is_closed():
+            await client.close()
+
 def main():
     """Entry point for the Discord Bot"""
-    asyncio.run(client.start(DISCORD_TOKEN))
+    start_periodic_processing()
+    asyncio.run(run_client())
 
 if __name__ == "__main__":
     import asyncio
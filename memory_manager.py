@@ -1,12 +1,20 @@
 import os
-import json
+import orjson
 import pickle
+import pickletools
+import tempfile
 import uuid
+from array import array
+from collections.abc import MutableMapping
 from datetime import datetime
+from functools import cached_property
 import threading
 import numpy as np
 import time
+import queue
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from groq import Groq
 import asyncio
 from dotenv import load_dotenv
@@ -15,15 +23,45 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Configure detailed logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('memory_manager.log'),
-        logging.StreamHandler()
-    ]
-)
+# File writes go through a queue drained by a background listener thread,
+# so logging on hot paths never blocks on disk I/O.
+log_queue = queue.Queue(-1)
+log_file_handler = logging.FileHandler('memory_manager.log')
+log_file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+log_listener = QueueListener(log_queue, log_file_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# Records are formatted once, by the file handler
+log_queue_handler = QueueHandler(log_queue)
+log_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
+log_stream_handler = logging.StreamHandler()
+log_stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+# Handlers go on the named logger; root may already be configured by an
+# earlier import, which makes basicConfig a no-op
 logger = logging.getLogger('MemoryManager')
+logger.setLevel(logging.INFO)
+logger.addHandler(log_queue_handler)
+logger.addHandler(log_stream_handler)
+logger.propagate = False
+
+# Optional LZ4 compression for pickle snapshots
+try:
+    import blosc2
+except ImportError:
+    blosc2 = None
+    logger.warning("blosc2 not found. Memory snapshots will be stored uncompressed.")
+
+# Header marking a blosc2-compressed pickle snapshot
+COMPRESSED_PICKLE_MAGIC = b'BLOSC2PK'
+
+# Seconds to coalesce memory changes before a snapshot save
+SAVE_DEBOUNCE = 1.0
+
+# Number of UUIDs generated per os.urandom call
+UUID_BATCH_SIZE = 256
 
 def json_numpy_serializer(obj):
     """
@@ -40,10 +78,148 @@ def json_numpy_serializer(obj):
         return obj.tolist()
     elif isinstance(obj, datetime):
         return obj.isoformat()
+    elif isinstance(obj, ConversationStore):
+        return obj.to_dict()
     else:
         # Let the base JSON serializer handle other types
         raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
+def format_entry_timestamps(memory_context):
+    """
+    Convert nanosecond epoch timestamps of memory entries to ISO format in place
+    
+    Entries store 'timestamp' as an int from time.time_ns(); formatting is
+    deferred until the memory is serialized for display.
+    
+    :param memory_context: Dictionary of memory entries
+    :return: The same dictionary with ISO formatted timestamps
+    """
+    if isinstance(memory_context, dict):
+        for entry in memory_context.values():
+            if isinstance(entry, dict) and isinstance(entry.get('timestamp'), int):
+                entry['timestamp'] = datetime.fromtimestamp(entry['timestamp'] / 1e9).isoformat()
+    return memory_context
+
+class ConversationStore(MutableMapping):
+    """
+    Column-oriented (structure of arrays) conversation storage
+    
+    Each field lives in its own column instead of one dict per entry;
+    timestamps are kept in a contiguous int64 array. Entries are exposed
+    through the usual mapping interface as freshly built dicts.
+    """
+    
+    def __init__(self):
+        self.conv_ids = []
+        self.conv_ts = array('q')  # Nanosecond epoch timestamps
+        self.conv_user = []
+        self.conv_bot = []
+        self.conv_metadata = []
+        self._index = {}
+    
+    @classmethod
+    def from_dict(cls, conversations):
+        """
+        Build a store from a legacy dict-of-dicts conversation mapping
+        
+        :param conversations: Mapping of conversation ID to entry dict
+        :return: New ConversationStore
+        """
+        store = cls()
+        for conversation_id, entry in conversations.items():
+            timestamp = entry.get('timestamp', 0)
+            if isinstance(timestamp, str):
+                timestamp = int(datetime.fromisoformat(timestamp).timestamp() * 1e9)
+            store.append(
+                conversation_id,
+                timestamp,
+                entry.get('user_message'),
+                entry.get('bot_response'),
+                entry.get('metadata', {})
+            )
+        return store
+    
+    def append(self, conversation_id, timestamp, user_message, bot_response, metadata=None):
+        """
+        Append a conversation, or overwrite it if the ID already exists
+        
+        :param conversation_id: Unique conversation ID
+        :param timestamp: Nanosecond epoch timestamp
+        :param user_message: User's message
+        :param bot_response: Bot's response
+        :param metadata: Optional metadata dictionary
+        """
+        metadata = metadata if metadata is not None else {}
+        index = self._index.get(conversation_id)
+        if index is None:
+            self._index[conversation_id] = len(self.conv_ids)
+            self.conv_ids.append(conversation_id)
+            self.conv_ts.append(timestamp)
+            self.conv_user.append(user_message)
+            self.conv_bot.append(bot_response)
+            self.conv_metadata.append(metadata)
+        else:
+            self.conv_ts[index] = timestamp
+            self.conv_user[index] = user_message
+            self.conv_bot[index] = bot_response
+            self.conv_metadata[index] = metadata
+    
+    def timestamps(self):
+        """
+        :return: Zero-copy int64 NumPy view of the timestamp column
+        """
+        return np.frombuffer(self.conv_ts, dtype=np.int64)
+    
+    def to_dict(self):
+        """
+        :return: Dict-of-dicts representation of all conversations
+        """
+        return {conversation_id: self[conversation_id] for conversation_id in self.conv_ids}
+    
+    def __getitem__(self, conversation_id):
+        index = self._index[conversation_id]
+        return {
+            'timestamp': self.conv_ts[index],
+            'user_message': self.conv_user[index],
+            'bot_response': self.conv_bot[index],
+            'metadata': self.conv_metadata[index]
+        }
+    
+    def __setitem__(self, conversation_id, entry):
+        self.append(
+            conversation_id,
+            entry['timestamp'],
+            entry['user_message'],
+            entry['bot_response'],
+            entry.get('metadata', {})
+        )
+    
+    def __delitem__(self, conversation_id):
+        index = self._index.pop(conversation_id)
+        for column in (self.conv_ids, self.conv_ts, self.conv_user, self.conv_bot, self.conv_metadata):
+            del column[index]
+        self._index = {cid: i for i, cid in enumerate(self.conv_ids)}
+    
+    def __iter__(self):
+        return iter(self.conv_ids)
+    
+    def __len__(self):
+        return len(self.conv_ids)
+    
+    def __getstate__(self):
+        # The index is derived from conv_ids, so it is not pickled
+        return {
+            'conv_ids': self.conv_ids,
+            'conv_ts': self.conv_ts,
+            'conv_user': self.conv_user,
+            'conv_bot': self.conv_bot,
+            'conv_metadata': self.conv_metadata
+        }
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._index = {cid: i for i, cid in enumerate(self.conv_ids)}
+
 class PersistentMemoryManager:
     def __init__(self, storage_path='memory_storage'):
         self.storage_path = storage_path
@@ -51,29 +227,28 @@ class PersistentMemoryManager:
         # Ensure memory directories exist
         self.ensure_memory_directories()
         
-        # Groq API Client with secure key retrieval
-        try:
-            groq_api_key = os.getenv('GROQ_API_KEY')
-            if not groq_api_key:
-                logger.error("Groq API Key is not set in environment variables")
-                self.groq_client = None
-            else:
-                try:
-                    self.groq_client = Groq(api_key=groq_api_key)
-                    logger.info("Groq client initialized successfully")
-                except Exception as init_error:
-                    logger.error(f"Failed to initialize Groq client: {init_error}")
-                    self.groq_client = None
-        except Exception as e:
-            logger.error(f"Unexpected error during Groq client setup: {e}")
-            self.groq_client = None
-        
         # Comprehensive memory storage structures
-        self.conversations = {}
+        self.conversations = ConversationStore()
         self.rewards = {}
         self.learning_history = {}
         self.system_state = {}
         
+        # Guards the memory dictionaries against concurrent save snapshots
+        self._save_lock = threading.Lock()
+        
+        # Set by changes not yet saved; a background thread coalesces the saves
+        self._dirty = threading.Event()
+        self._saver_lock = threading.Lock()
+        self._saver_thread = None
+        
+        # Callbacks notified of newly recorded conversations
+        self._conversation_listeners = []
+        
+        # Batched random bytes for generate_unique_id
+        self._uuid_lock = threading.Lock()
+        self._uuid_buf = b''
+        self._uuid_cursor = 0
+        
         # Persistent storage files and directories
         self.memory_dir = os.path.join(os.getcwd(), 'memory')
         self.conversations_file = os.path.join(storage_path, 'conversations.pkl')
@@ -81,11 +256,42 @@ class PersistentMemoryManager:
         self.learning_history_file = os.path.join(storage_path, 'learning_history.pkl')
         self.system_state_file = os.path.join(storage_path, 'system_state.pkl')
         
+        # Cached user IDs, invalidated when the memory directory changes
+        self._user_ids_cache = None
+        self._memory_dir_mtime = None
+        
+        # Temporary files left behind by an interrupted write
+        self._remove_stale_temp_files()
+        
         # Load existing data or initialize
         self.load_memory()
         
         logger.info("Memory Manager initialized successfully")
     
+    @cached_property
+    def groq_client(self):
+        """
+        Groq API Client with secure key retrieval, created on first use
+        
+        :return: Groq client, or None if it could not be initialized
+        """
+        try:
+            groq_api_key = os.getenv('GROQ_API_KEY')
+            if not groq_api_key:
+                logger.error("Groq API Key is not set in environment variables")
+                return None
+            
+            try:
+                groq_client = Groq(api_key=groq_api_key)
+                logger.info("Groq client initialized successfully")
+                return groq_client
+            except Exception as init_error:
+                logger.error(f"Failed to initialize Groq client: {init_error}")
+                return None
+        except Exception as e:
+            logger.error(f"Unexpected error during Groq client setup: {e}")
+            return None
+    
     def ensure_memory_directories(self):
         """
         Ensure all necessary memory directories exist
@@ -103,6 +309,23 @@ class PersistentMemoryManager:
             except Exception as e:
                 logger.error(f"Error creating directory {directory}: {e}")
     
+    def _remove_stale_temp_files(self):
+        """
+        Remove temporary files left in the memory and storage directories
+        by writes interrupted before their os.replace
+        """
+        for directory in (self.memory_dir, self.storage_path):
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.endswith('.tmp') and entry.is_file():
+                            os.unlink(entry.path)
+                            logger.info(f"Removed stale temporary file: {entry.path}")
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.error(f"Error removing temporary files from {directory}: {e}")
+    
     def create_user_memory_file(self, user_id):
         """
         Create a memory file for a specific user
@@ -111,16 +334,12 @@ class PersistentMemoryManager:
         :return: Path to the created memory file
         """
         try:
-            # Ensure memory directory exists
-            os.makedirs(self.memory_dir, exist_ok=True)
-            
             # Create user memory file path
             user_memory_file = os.path.join(self.memory_dir, f"{user_id}.json")
             
             # Create the file if it doesn't exist
             if not os.path.exists(user_memory_file):
-                with open(user_memory_file, 'w', encoding='utf-8') as f:
-                    json.dump({}, f)
+                self._write_user_memory_file(user_memory_file, {})
                 logger.info(f"Created memory file for user {user_id}")
             
             return user_memory_file
@@ -128,6 +347,38 @@ class PersistentMemoryManager:
             logger.error(f"Error creating memory file for user {user_id}: {e}")
             return None
     
+    def _write_user_memory_file(self, user_memory_file, memory_data):
+        """
+        Atomically write memory data to a user memory file
+        
+        The data is written to a temporary file in the same directory and
+        moved into place with os.replace, so a crash never leaves a
+        truncated or partially written memory file behind.
+        
+        :param user_memory_file: Destination file path
+        :param memory_data: Memory data to save
+        """
+        # Encode once and issue a single write instead of json.dump's per-token writes
+        data = orjson.dumps(
+            memory_data,
+            default=json_numpy_serializer,
+            option=orjson.OPT_NON_STR_KEYS
+        )
+        
+        # A unique temporary file per write keeps concurrent saves of the same user apart
+        fd, tmp_file = tempfile.mkstemp(
+            dir=os.path.dirname(user_memory_file),
+            prefix=os.path.basename(user_memory_file) + '.',
+            suffix='.tmp'
+        )
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, user_memory_file)
+        except BaseException:
+            os.unlink(tmp_file)
+            raise
+    
     def save_user_memory(self, user_id, memory_data):
         """
         Save memory data for a specific user
@@ -136,13 +387,10 @@ class PersistentMemoryManager:
         :param memory_data: Memory data to save
         """
         try:
-            # Create user memory file if it doesn't exist
-            user_memory_file = self.create_user_memory_file(user_id)
+            user_memory_file = os.path.join(self.memory_dir, f"{user_id}.json")
             
-            if user_memory_file:
-                with open(user_memory_file, 'w', encoding='utf-8') as f:
-                    json.dump(memory_data, f, indent=2, default=json_numpy_serializer)
-                logger.info(f"Saved memory for user {user_id}")
+            self._write_user_memory_file(user_memory_file, memory_data)
+            logger.info(f"Saved memory for user {user_id}")
         except Exception as e:
             logger.error(f"Error saving memory for user {user_id}: {e}")
     
@@ -161,8 +409,8 @@ class PersistentMemoryManager:
                 self.create_user_memory_file(user_id)
                 return {}
             
-            with open(user_memory_file, 'r', encoding='utf-8') as f:
-                memory_data = json.load(f)
+            with open(user_memory_file, 'rb') as f:
+                memory_data = orjson.loads(f.read())
                 logger.info(f"Loaded memory for user {user_id}")
                 return memory_data
         except Exception as e:
@@ -175,34 +423,50 @@ class PersistentMemoryManager:
         
         :param memory_context: Dictionary of memory context
         :param max_tokens: Maximum number of tokens to allow
-        :return: Truncated memory context
+        :return: Tuple of (truncated memory context, its UTF-8 encoded JSON)
         """
         # Create a deep copy to avoid modifying original data
-        context_copy = json.loads(json.dumps(memory_context, default=json_numpy_serializer))
+        context_copy = orjson.loads(orjson.dumps(
+            memory_context,
+            default=json_numpy_serializer,
+            option=orjson.OPT_NON_STR_KEYS
+        ))
+        format_entry_timestamps(context_copy)
         
-        # Convert to JSON and truncate
-        full_json = json.dumps(context_copy, indent=2, default=json_numpy_serializer)
+        max_bytes = max_tokens * 4  # Rough token estimation
         
-        # If full JSON is too large, progressively reduce
-        while len(full_json.encode('utf-8')) > max_tokens * 4:  # Rough token estimation
-            # Remove oldest or least important entries
+        if isinstance(context_copy, (dict, list)) and context_copy:
+            # Measure each top-level entry once as it appears in the compact
+            # document, then drop the oldest entries by keeping a running total
+            # instead of re-encoding the whole context after every removal.
+            items = context_copy.items() if isinstance(context_copy, dict) else enumerate(context_copy)
+            entry_sizes = []
+            for key, value in items:
+                size = len(orjson.dumps(value))
+                if isinstance(context_copy, dict):
+                    size += len(orjson.dumps(key)) + 1  # '"key":'
+                entry_sizes.append(size)
+            
+            # '{' + entries joined by ',' + '}'
+            total_size = 2 + sum(entry_sizes) + len(entry_sizes) - 1
+            
+            drop_count = 0
+            while total_size > max_bytes and drop_count < len(entry_sizes):
+                total_size -= entry_sizes[drop_count]
+                if drop_count < len(entry_sizes) - 1:
+                    total_size -= 1  # Its separator
+                drop_count += 1
+            
+            # Remove the oldest entries
             if isinstance(context_copy, dict):
-                if context_copy:
-                    # Remove the first/oldest key
-                    oldest_key = list(context_copy.keys())[0]
+                for oldest_key in list(context_copy.keys())[:drop_count]:
                     del context_copy[oldest_key]
-                else:
-                    break
-            elif isinstance(context_copy, list):
-                if context_copy:
-                    context_copy.pop(0)
-                else:
-                    break
-            
-            # Regenerate JSON
-            full_json = json.dumps(context_copy, indent=2, default=json_numpy_serializer)
+            else:
+                del context_copy[:drop_count]
+        
+        full_json = orjson.dumps(context_copy)
         
-        return context_copy
+        return context_copy, full_json
     
     async def send_memory_to_groq(self, context_type='conversations'):
         """
@@ -223,20 +487,15 @@ class PersistentMemoryManager:
                 logger.warning(f"No memory found in {context_type}")
                 return None
             
-            # Truncate memory context to avoid rate limits
-            truncated_memory = self.truncate_memory_context(memory_context)
-            
-            # Convert memory to a comprehensive prompt
-            memory_prompt = json.dumps(
-                truncated_memory, 
-                indent=2, 
-                default=json_numpy_serializer
-            )
+            # Truncate memory context to avoid rate limits; reuse its encoding as the prompt
+            _, encoded_memory = self.truncate_memory_context(memory_context)
+            memory_prompt = encoded_memory.decode('utf-8')
             
             logger.info(f"Preparing to send {context_type} to Groq API")
             
-            # Send to Groq API
-            response = self.groq_client.chat.completions.create(
+            # Send to Groq API (on a worker thread so concurrent sends overlap)
+            response = await asyncio.to_thread(
+                self.groq_client.chat.completions.create,
                 model="Llama-3.3-70B-Versatile",  # Exclusively using Llama-3.3-70B-Versatile
                 messages=[
                     {
@@ -264,13 +523,25 @@ class PersistentMemoryManager:
         """
         Process all memory types with Groq API
         """
+        try:
+            asyncio.run(self._process_all_memories())
+        except Exception as e:
+            logger.error(f"Error processing memories: {e}")
+    
+    async def _process_all_memories(self):
+        """
+        Send every memory type to Groq API concurrently on a single event loop
+        """
         memory_types = ['system_state', 'conversations', 'rewards', 'learning_history']
         
-        for memory_type in memory_types:
-            try:
-                asyncio.run(self.send_memory_to_groq(memory_type))
-            except Exception as e:
-                logger.error(f"Error processing {memory_type} memory: {e}")
+        results = await asyncio.gather(
+            *[self.send_memory_to_groq(memory_type) for memory_type in memory_types],
+            return_exceptions=True
+        )
+        
+        for memory_type, result in zip(memory_types, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error processing {memory_type} memory: {result}")
     
     def log_memory_interaction(self, interaction_type, details):
         """
@@ -282,99 +553,231 @@ class PersistentMemoryManager:
         logger.info(f"Memory Interaction - Type: {interaction_type}, Details: {details}")
     
     def generate_unique_id(self):
-        return str(uuid.uuid4())
+        """
+        Generate a random (version 4) UUID string
+        
+        Random bytes are drawn from the OS CSPRNG in batches of
+        UUID_BATCH_SIZE IDs, amortizing the urandom call across many records.
+        
+        :return: UUID string
+        """
+        with self._uuid_lock:
+            if self._uuid_cursor >= len(self._uuid_buf):
+                self._uuid_buf = os.urandom(16 * UUID_BATCH_SIZE)
+                self._uuid_cursor = 0
+            start = self._uuid_cursor
+            self._uuid_cursor += 16
+            random_bytes = self._uuid_buf[start:start + 16]
+        return str(uuid.UUID(bytes=random_bytes, version=4))
+    
+    def _pickle_snapshots(self):
+        """
+        Pickle all memory components while holding the save lock
+        
+        Writers only mutate the dictionaries under the same lock, so the
+        snapshots are consistent without copying each dictionary first.
+        
+        :return: List of (file path, pickled bytes) pairs
+        """
+        with self._save_lock:
+            return [
+                (path, pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+                for path, obj in (
+                    (self.conversations_file, self.conversations),
+                    (self.rewards_file, self.rewards),
+                    (self.learning_history_file, self.learning_history),
+                    (self.system_state_file, self.system_state)
+                )
+            ]
+    
+    def _write_pickle(self, path, data):
+        """
+        Atomically write pickled bytes to disk
+        
+        The pickle is first stripped of unused PUT opcodes, which shrinks
+        the file and speeds up load_memory. When blosc2 is available it is
+        then LZ4-compressed, so large snapshots cost far fewer bytes on disk.
+        The bytes go to a unique temporary file that replaces the target
+        once fsynced, so a crash never leaves a truncated snapshot.
+        
+        :param path: Destination file path
+        :param data: Pickled bytes from _pickle_snapshots
+        """
+        data = pickletools.optimize(data)
+        if blosc2 is not None:
+            data = COMPRESSED_PICKLE_MAGIC + blosc2.compress2(data, codec=blosc2.Codec.LZ4)
+        
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + '.', suffix='.tmp')
+        try:
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    def _fsync_storage_directory(self):
+        """
+        Flush the storage directory entry once after a batch of snapshot writes
+        
+        A single directory barrier makes all snapshot renames durable
+        together. Not supported (and not needed) on Windows.
+        """
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        
+        dir_fd = os.open(self.storage_path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    
+    def _load_pickle(self, path):
+        """
+        Load a pickle written by _write_pickle (compressed or plain)
+        
+        :param path: Source file path
+        :return: Unpickled object
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        
+        if not data:
+            raise EOFError(f"Empty memory file: {path}")
+        
+        if data.startswith(COMPRESSED_PICKLE_MAGIC):
+            if blosc2 is None:
+                raise RuntimeError(f"{path} is blosc2-compressed but blosc2 is not installed")
+            data = blosc2.decompress2(data[len(COMPRESSED_PICKLE_MAGIC):])
+        
+        return pickle.loads(data)
     
     def save_memory(self):
         """Save all memory components persistently"""
         try:
-            # Create deep copies to prevent modification during iteration
-            conversations_copy = self.conversations.copy()
-            rewards_copy = self.rewards.copy()
-            learning_history_copy = self.learning_history.copy()
-            system_state_copy = self.system_state.copy()
-            
-            with open(self.conversations_file, 'wb') as f:
-                pickle.dump(conversations_copy, f)
-            
-            with open(self.rewards_file, 'wb') as f:
-                pickle.dump(rewards_copy, f)
-            
-            with open(self.learning_history_file, 'wb') as f:
-                pickle.dump(learning_history_copy, f)
-            
-            with open(self.system_state_file, 'wb') as f:
-                pickle.dump(system_state_copy, f)
+            for path, data in self._pickle_snapshots():
+                self._write_pickle(path, data)
+            self._fsync_storage_directory()
         except Exception as e:
             logger.error(f"Error saving memory: {e}")
             # Optional: Add logging or error handling mechanism
     
+    def schedule_save(self):
+        """
+        Mark memory as changed and save it shortly in the background
+        
+        Changes made within SAVE_DEBOUNCE seconds of each other share a
+        single save_memory call, and pending changes are saved at exit.
+        """
+        self._dirty.set()
+        if self._saver_thread is not None:
+            return
+        
+        with self._saver_lock:
+            if self._saver_thread is None:
+                self._saver_thread = threading.Thread(target=self._save_dirty_memory, daemon=True)
+                self._saver_thread.start()
+                atexit.register(self._save_pending_memory)
+    
+    def _save_dirty_memory(self):
+        """Background loop saving memory once changes have settled"""
+        while True:
+            self._dirty.wait()
+            time.sleep(SAVE_DEBOUNCE)
+            self._save_pending_memory()
+    
+    def _save_pending_memory(self):
+        """Save memory if there are unsaved changes"""
+        if self._dirty.is_set():
+            # Cleared first so changes made during the save trigger another one
+            self._dirty.clear()
+            self.save_memory()
+    
     def load_memory(self):
         """Load existing memory or initialize if not exists"""
         try:
-            with open(self.conversations_file, 'rb') as f:
-                self.conversations = pickle.load(f)
+            self.conversations = self._load_pickle(self.conversations_file)
+            if not isinstance(self.conversations, ConversationStore):
+                # Migrate legacy dict-of-dicts snapshots to the columnar store
+                self.conversations = ConversationStore.from_dict(self.conversations)
         except (FileNotFoundError, EOFError):
-            self.conversations = {}
+            self.conversations = ConversationStore()
         
         try:
-            with open(self.rewards_file, 'rb') as f:
-                self.rewards = pickle.load(f)
+            self.rewards = self._load_pickle(self.rewards_file)
         except (FileNotFoundError, EOFError):
             self.rewards = {}
         
         try:
-            with open(self.learning_history_file, 'rb') as f:
-                self.learning_history = pickle.load(f)
+            self.learning_history = self._load_pickle(self.learning_history_file)
         except (FileNotFoundError, EOFError):
             self.learning_history = {}
         
         try:
-            with open(self.system_state_file, 'rb') as f:
-                self.system_state = pickle.load(f)
+            self.system_state = self._load_pickle(self.system_state_file)
         except (FileNotFoundError, EOFError):
             self.system_state = {}
     
     def record_conversation(self, user_message, bot_response):
         """Record comprehensive conversation details"""
         conversation_id = self.generate_unique_id()
-        conversation_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'user_message': user_message,
-            'bot_response': bot_response,
-            'metadata': {}
-        }
         
-        self.conversations[conversation_id] = conversation_entry
-        self.save_memory()
+        with self._save_lock:
+            self.conversations.append(conversation_id, time.time_ns(), user_message, bot_response)
+            conversation_entry = self.conversations[conversation_id]
+        self.schedule_save()
         self.log_memory_interaction('write', f"Conversation ID: {conversation_id}")
+        
+        for listener in self._conversation_listeners:
+            try:
+                listener(conversation_id, conversation_entry)
+            except Exception as e:
+                logger.error(f"Error notifying conversation listener: {e}")
+        
         return conversation_id
     
+    def add_conversation_listener(self, listener):
+        """
+        Register a callback invoked after each recorded conversation
+        
+        :param listener: Callable taking (conversation_id, conversation_entry)
+        """
+        self._conversation_listeners.append(listener)
+    
     def record_reward(self, conversation_id, reward_value):
         """Record reward for a specific conversation"""
-        self.rewards[conversation_id] = {
-            'timestamp': datetime.now().isoformat(),
-            'reward_value': reward_value
-        }
-        self.save_memory()
+        with self._save_lock:
+            self.rewards[conversation_id] = {
+                'timestamp': time.time_ns(),
+                'reward_value': reward_value
+            }
+        self.schedule_save()
         self.log_memory_interaction('write', f"Conversation ID: {conversation_id}, Reward Value: {reward_value}")
     
     def record_learning_event(self, event_type, details):
         """Record learning and evolution events"""
         event_id = self.generate_unique_id()
         learning_entry = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': time.time_ns(),
             'event_type': event_type,
             'details': details
         }
         
-        self.learning_history[event_id] = learning_entry
-        self.save_memory()
+        with self._save_lock:
+            self.learning_history[event_id] = learning_entry
+        self.schedule_save()
         self.log_memory_interaction('write', f"Event ID: {event_id}, Event Type: {event_type}")
     
     def update_system_state(self, key, value):
         """Update and persist system state"""
-        self.system_state[key] = value
-        self.save_memory()
+        with self._save_lock:
+            self.system_state[key] = value
+        self.schedule_save()
         self.log_memory_interaction('update', f"Key: {key}, Value: {value}")
     
     def periodic_backup(self, interval=300):
@@ -394,25 +797,52 @@ class PersistentMemoryManager:
         :return: List of user IDs
         """
         try:
-            # Ensure memory directory exists
-            os.makedirs(self.memory_dir, exist_ok=True)
+            # Directory mtime only changes when files are added or removed
+            memory_dir_mtime = os.stat(self.memory_dir).st_mtime_ns
+            if self._user_ids_cache is not None and memory_dir_mtime == self._memory_dir_mtime:
+                return list(self._user_ids_cache)
+            
+            # Get all JSON files in the memory directory (remove .json extension to get user ID)
+            with os.scandir(self.memory_dir) as entries:
+                user_ids = [
+                    entry.name[:-5] for entry in entries
+                    if entry.name.endswith('.json') and entry.is_file()
+                ]
             
-            # Get all JSON files in the memory directory
-            user_ids = []
-            for filename in os.listdir(self.memory_dir):
-                if filename.endswith('.json'):
-                    # Remove .json extension to get user ID
-                    user_id = filename[:-5]
-                    user_ids.append(user_id)
+            self._user_ids_cache = user_ids
+            self._memory_dir_mtime = memory_dir_mtime
             
             logger.info(f"Retrieved {len(user_ids)} user IDs")
-            return user_ids
+            return list(user_ids)
         except Exception as e:
             logger.error(f"Error retrieving user IDs: {e}")
             return []
 
-# Instantiate memory manager
-memory_manager = PersistentMemoryManager()
+# Memory manager singleton, created on first access unless MM_EAGER is set
+_memory_manager = None
+_memory_manager_lock = threading.Lock()
+
+def get_memory_manager():
+    """
+    Return the shared memory manager, instantiating it on first use
+    
+    :return: PersistentMemoryManager singleton
+    """
+    global _memory_manager
+    if _memory_manager is None:
+        with _memory_manager_lock:
+            if _memory_manager is None:
+                _memory_manager = PersistentMemoryManager()
+    return _memory_manager
+
+def __getattr__(name):
+    # Keeps `from memory_manager import memory_manager` working lazily
+    if name == 'memory_manager':
+        return get_memory_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+if os.getenv('MM_EAGER'):
+    memory_manager = get_memory_manager()
 
 # Optional: Periodically process memories
 def periodic_memory_processing():
@@ -422,12 +852,27 @@ def periodic_memory_processing():
     while True:
         try:
             logger.info("Starting periodic memory processing...")
-            memory_manager.process_all_memories()
+            get_memory_manager().process_all_memories()
             time.sleep(3600)  # Process memories every hour
         except Exception as e:
             logger.error(f"Error in periodic memory processing: {e}")
             time.sleep(3600)  # Wait an hour before retrying
 
-# Start periodic memory processing in a separate thread
-memory_processing_thread = threading.Thread(target=periodic_memory_processing, daemon=True)
-memory_processing_thread.start()
+memory_processing_thread = None
+
+def start_periodic_processing():
+    """
+    Start periodic memory processing in a separate thread (at most once per process)
+    
+    :return: The background processing thread
+    """
+    global memory_processing_thread
+    if memory_processing_thread is None or not memory_processing_thread.is_alive():
+        memory_processing_thread = threading.Thread(target=periodic_memory_processing, daemon=True)
+        memory_processing_thread.start()
+    return memory_processing_thread
+
+if __name__ == '__main__':
+    start_periodic_processing()
+    memory_processing_thread.join()
+
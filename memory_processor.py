@@ -1,23 +1,54 @@
 import os
-import json
+import orjson
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import collections
+import mmap
+import time
+import atexit
+import threading
+import queue
 from typing import List, Dict, Any
 import tiktoken
-from groq import Groq
-from datetime import datetime, timedelta
+from groq import Groq, AsyncGroq
+from datetime import datetime
 import uuid
 import asyncio
 
 # Gelişmiş logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s: %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('advanced_memory.log', encoding='utf-8', mode='a')
-    ]
-)
+# Dosya yazımları arka plandaki bir dinleyici iş parçacığına kuyruklanır,
+# böylece sık çağrılan yollar disk G/Ç'sini beklemez.
+log_queue = queue.Queue(-1)
+log_file_handler = logging.FileHandler('advanced_memory.log', encoding='utf-8', mode='a')
+log_file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s: %(message)s'))
+log_listener = QueueListener(log_queue, log_file_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# Kayıtlar yalnızca bir kez, dosya işleyicisi tarafından biçimlendirilir
+log_queue_handler = QueueHandler(log_queue)
+log_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
+log_stream_handler = logging.StreamHandler()
+log_stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s: %(message)s'))
+
+# İşleyiciler modülün adlandırılmış logger'ına eklenir; kök logger daha önce
+# yapılandırılmışsa basicConfig hiçbir şey yapmaz
 logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(log_stream_handler)
+logger.addHandler(log_queue_handler)
+logger.propagate = False
+
+# Kullanıcı başına satır başına JSON mesaj günlüğü
+MESSAGE_LOG_FILENAME = 'msgs.jsonl'
+
+# Eski kayıt temizliğinin kaç kayıtta bir çalışacağı
+CLEANUP_INTERVAL = 1000
+
+# Bekleyen mesajların diske yazılma aralığı (saniye) ve erken yazma eşiği
+FLUSH_INTERVAL = 0.5
+FLUSH_BATCH_SIZE = 64
 
 class AdvancedMemoryManager:
     def __init__(self, memory_dir: str = 'memory', max_memory_days: int = 365):
@@ -34,11 +65,97 @@ class AdvancedMemoryManager:
         # Kullanıcı bazında hafıza dizinleri
         self.user_memory_dir = os.path.join(memory_dir, 'users')
         os.makedirs(self.user_memory_dir, exist_ok=True)
+        
+        # Kullanıcı başına kayıt sayacı (temizliği seyreltmek için)
+        self._save_counter = collections.Counter()
+        
+        # Eski dosya taşıması yapılmış kullanıcı dizinleri
+        self._migrated_dirs = set()
+        
+        # Diske yazılmayı bekleyen (günlük yolu, satır) kayıtları
+        self._pending = collections.deque()
+        # Yeniden girilebilir: clean_old_memories kilidi tutarken flush() çağırır
+        self._flush_lock = threading.RLock()
+        self._flush_event = threading.Event()
+        self._flush_thread = None
+        atexit.register(self.flush)
+
+    def _start_flush_thread(self):
+        """Bekleyen mesajları periyodik olarak diske yazan arka plan iş parçacığını başlat"""
+        def flush_loop():
+            while True:
+                self._flush_event.wait(timeout=FLUSH_INTERVAL)
+                self._flush_event.clear()
+                self.flush()
+        
+        self._flush_thread = threading.Thread(target=flush_loop, daemon=True)
+        self._flush_thread.start()
+
+    def flush(self):
+        """
+        Bekleyen tüm mesajları günlük dosyalarına yaz
+        
+        Her günlük dosyası bir kez O_APPEND ile açılır ve satırlar tek bir
+        writev çağrısıyla (yoksa tek bir write ile) eklenir.
+        """
+        with self._flush_lock:
+            batches = collections.defaultdict(list)
+            while self._pending:
+                log_path, line = self._pending.popleft()
+                batches[log_path].append(line)
+            
+            for log_path, lines in batches.items():
+                try:
+                    fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+                    try:
+                        data = b''.join(lines)
+                        written = 0
+                        if hasattr(os, 'writev'):
+                            # writev en fazla IOV_MAX parça alır; kalan kısım aşağıda yazılır
+                            written = os.writev(fd, lines[:1024])
+                        view = memoryview(data)[written:]
+                        while view:
+                            view = view[os.write(fd, view):]
+                    finally:
+                        os.close(fd)
+                except Exception as e:
+                    logger.error(f"Mesaj günlüğü yazma hatası ({log_path}): {e}")
+
+    def _migrate_legacy_messages(self, user_dir: str):
+        """
+        Eski mesaj başına JSON dosyalarını (msg_*.json) kullanıcının mesaj günlüğüne taşı
+        
+        Args:
+            user_dir (str): Kullanıcı hafıza dizini
+        """
+        if user_dir in self._migrated_dirs:
+            return
+        
+        with os.scandir(user_dir) as entries:
+            legacy_files = sorted(e.name for e in entries if e.name.startswith('msg_') and e.name.endswith('.json'))
+        self._migrated_dirs.add(user_dir)
+        if not legacy_files:
+            return
+        
+        with open(os.path.join(user_dir, MESSAGE_LOG_FILENAME), 'ab') as log:
+            for filename in legacy_files:
+                filepath = os.path.join(user_dir, filename)
+                with open(filepath, 'rb') as f:
+                    log.write(orjson.dumps(orjson.loads(f.read())) + b'\n')
+        
+        for filename in legacy_files:
+            os.remove(os.path.join(user_dir, filename))
+        
+        logger.info(f"{len(legacy_files)} eski mesaj dosyası günlüğe taşındı: {user_dir}")
 
     def save_user_message(self, user_id: str, message: str, is_bot: bool = False, context: Dict = None):
         """
         Kullanıcı mesajlarını kullanıcı bazında kaydet
         
+        Mesajlar kullanıcı dizinindeki tek bir satır başına JSON günlüğüne (msgs.jsonl) eklenir.
+        Yazmalar bellekte biriktirilir ve FLUSH_INTERVAL saniyede bir ya da
+        FLUSH_BATCH_SIZE kayıt birikince toplu olarak diske yazılır.
+        
         Args:
             user_id (str): Kullanıcı ID'si
             message (str): Mesaj içeriği
@@ -47,7 +164,9 @@ class AdvancedMemoryManager:
         """
         try:
             user_dir = os.path.join(self.user_memory_dir, user_id)
-            os.makedirs(user_dir, exist_ok=True)
+            if user_dir not in self._migrated_dirs:
+                os.makedirs(user_dir, exist_ok=True)
+                self._migrate_legacy_messages(user_dir)
             
             timestamp = datetime.utcnow().isoformat() + 'Z'
             memory_entry = {
@@ -57,16 +176,19 @@ class AdvancedMemoryManager:
                 "context": context or {}
             }
             
-            filename = f"msg_{timestamp.replace(':', '-')}.json"
-            filepath = os.path.join(user_dir, filename)
+            if self._flush_thread is None:
+                self._start_flush_thread()
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(memory_entry, f, ensure_ascii=False, indent=2)
+            self._pending.append((os.path.join(user_dir, MESSAGE_LOG_FILENAME), orjson.dumps(memory_entry) + b'\n'))
+            if len(self._pending) >= FLUSH_BATCH_SIZE:
+                self._flush_event.set()
             
-            logger.info(f"Kullanıcı mesajı kaydedildi: {user_id} - {filename}")
+            logger.info(f"Kullanıcı mesajı kaydedildi: {user_id} - {timestamp}")
             
-            # Eski kayıtları temizle
-            self.clean_old_memories(user_dir)
+            # Eski kayıtları temizle (her kayıtta değil, her CLEANUP_INTERVAL kayıtta bir)
+            if self._save_counter[user_id] % CLEANUP_INTERVAL == 0:
+                self.clean_old_memories(user_dir)
+            self._save_counter[user_id] += 1
         except Exception as e:
             logger.error(f"Mesaj kaydetme hatası: {e}")
 
@@ -74,18 +196,44 @@ class AdvancedMemoryManager:
         """
         Belirli günden eski hafıza kayıtlarını temizle
         
+        Günlük kronolojik sırayla yazıldığından yalnızca baştaki eski satırlar atılır.
+        
         Args:
             user_dir (str): Kullanıcı hafıza dizini
         """
         try:
-            now = datetime.utcnow()
-            for filename in os.listdir(user_dir):
-                filepath = os.path.join(user_dir, filename)
-                file_time = datetime.fromisoformat(filename.split('_')[1].replace('-', ':').replace('.json', ''))
+            # Arka plan yazımı okuma ile dosya değişimi arasında satır eklememeli
+            with self._flush_lock:
+                self.flush()
                 
-                if (now - file_time) > timedelta(days=self.max_memory_days):
-                    os.remove(filepath)
-                    logger.info(f"Eski hafıza kaydı silindi: {filename}")
+                log_path = os.path.join(user_dir, MESSAGE_LOG_FILENAME)
+                if not os.path.exists(log_path):
+                    return
+                
+                # Günlük son yazıldığından beri süre dolduysa tüm kayıtlar eskidir
+                cutoff = time.time() - self.max_memory_days * 86400
+                if os.stat(log_path).st_mtime < cutoff:
+                    os.unlink(log_path)
+                    logger.info(f"Süresi dolmuş hafıza günlüğü silindi: {user_dir}")
+                    return
+                
+                # ISO zaman damgaları saniye hassasiyetinde sözlük sırasıyla karşılaştırılabilir
+                cutoff_iso = datetime.utcfromtimestamp(cutoff).isoformat(timespec='seconds')
+                with open(log_path, 'rb') as f:
+                    lines = f.readlines()
+                
+                expired = 0
+                for line in lines:
+                    if orjson.loads(line)['timestamp'][:19] >= cutoff_iso:
+                        break
+                    expired += 1
+                
+                if expired:
+                    tmp_path = log_path + '.tmp'
+                    with open(tmp_path, 'wb') as f:
+                        f.writelines(lines[expired:])
+                    os.replace(tmp_path, log_path)
+                    logger.info(f"{expired} eski hafıza kaydı silindi: {user_dir}")
         except Exception as e:
             logger.error(f"Hafıza temizleme hatası: {e}")
 
@@ -93,29 +241,44 @@ class AdvancedMemoryManager:
         """
         Kullanıcının son mesaj geçmişini al
         
+        Günlük dosyası bellek eşlemeli (mmap) okunur ve yalnızca sondaki
+        `limit` satır geriye doğru taranarak çözümlenir.
+        
         Args:
             user_id (str): Kullanıcı ID'si
             limit (int): Getirilecek maksimum mesaj sayısı
         
         Returns:
-            List[Dict]: Kullanıcı mesaj geçmişi
+            List[Dict]: Kullanıcı mesaj geçmişi (en yeniden eskiye)
         """
+        if limit <= 0:
+            return []
+        
         user_dir = os.path.join(self.user_memory_dir, user_id)
+        if user_dir not in self._migrated_dirs:
+            if not os.path.isdir(user_dir):
+                return []
+            self._migrate_legacy_messages(user_dir)
+        self.flush()
         
-        if not os.path.exists(user_dir):
+        # Tek bir stat ile hem varlık hem boyut kontrolü
+        log_path = os.path.join(user_dir, MESSAGE_LOG_FILENAME)
+        try:
+            if os.stat(log_path).st_size == 0:
+                return []
+        except FileNotFoundError:
             return []
         
-        # Dosyaları zamana göre sırala
-        message_files = sorted(
-            [f for f in os.listdir(user_dir) if f.startswith('msg_')],
-            reverse=True
-        )
-        
         conversation_history = []
-        for filename in message_files[:limit]:
-            filepath = os.path.join(user_dir, filename)
-            with open(filepath, 'r', encoding='utf-8') as f:
-                conversation_history.append(json.load(f))
+        with open(log_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            if mm[end - 1:end] == b'\n':
+                end -= 1
+            
+            while end > 0 and len(conversation_history) < limit:
+                start = mm.rfind(b'\n', 0, end) + 1
+                conversation_history.append(orjson.loads(mm[start:end]))
+                end = start - 1
         
         return conversation_history
 
@@ -129,6 +292,7 @@ class GroqMemoryIntegrator:
             memory_manager (AdvancedMemoryManager): Hafıza yöneticisi
         """
         self.client = Groq(api_key=groq_api_key)
+        self.aclient = AsyncGroq(api_key=groq_api_key)
         self.memory_manager = memory_manager
         self.tokenizer = tiktoken.get_encoding("cl100k_base")
 
@@ -164,7 +328,7 @@ class GroqMemoryIntegrator:
             Analiz:
             """
             
-            response = self.client.chat.completions.create(
+            response = await self.aclient.chat.completions.create(
                 messages=[{"role": "system", "content": context_analysis_prompt}],
                 model="llama-3.3-70b-versatile"
             )
@@ -1,43 +1,88 @@
 import os
+import asyncio
+import hashlib
+import functools
+import diskcache
 import requests
+from requests.adapters import HTTPAdapter
 from groq import Groq
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Answers are cached briefly since queries like currency rates change quickly
+QUERY_CACHE_DIR = './query_cache'
+QUERY_CACHE_TTL = 300  # seconds
+
 class MultiQueryProcessor:
     def __init__(self):
         self.groq_client = Groq(api_key=os.getenv('GROQ_API_KEY'))
+        
+        # Reuse keep-alive connections across searches
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # On-disk cache of query answers
+        self.cache = diskcache.Cache(QUERY_CACHE_DIR)
     
     def web_search(self, query):
         """Simulate a web search (replace with actual web search API if available)"""
         try:
-            response = requests.get(f"https://www.google.com/search?q={query}")
+            response = self.session.get("https://www.google.com/search", params={'q': query})
             return response.text[:500]  # Limit response for demonstration
         except Exception as e:
             return f"Web search error: {str(e)}"
     
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _cache_key(query):
+        """Cache key for a query, normalized for case and surrounding whitespace"""
+        return hashlib.blake2b(query.lower().strip().encode('utf-8')).hexdigest()
+    
+    def _search_then_llm(self, query):
+        """Run the web search and LLM analysis steps for a single query"""
+        # Repeated queries (e.g. currency rates) skip both the search and the LLM call
+        cache_key = self._cache_key(query)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Step 1: Web Search
+        web_result = self.web_search(query)
+        
+        # Step 2: LLM Analysis
+        chat_completion = self.groq_client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": "You are an expert at extracting precise information from web search results."},
+                {"role": "user", "content": f"Analyze this web search result for the query '{query}': {web_result}. Extract the most relevant numerical information."}
+            ],
+            model="llama3-70b-8192"
+        )
+        
+        answer = chat_completion.choices[0].message.content
+        self.cache.set(cache_key, answer, expire=QUERY_CACHE_TTL)
+        return answer
+    
+    async def _process_concurrently(self, queries):
+        """Run every query's search and analysis in parallel"""
+        # Queries that normalize to the same key are searched only once
+        query_keys = {query: self._cache_key(query) for query in queries}
+        unique_queries = {}
+        for query, cache_key in query_keys.items():
+            unique_queries.setdefault(cache_key, query)
+        
+        answers = await asyncio.gather(
+            *[asyncio.to_thread(self._search_then_llm, query) for query in unique_queries.values()]
+        )
+        answers_by_key = dict(zip(unique_queries, answers))
+        return {query: answers_by_key[cache_key] for query, cache_key in query_keys.items()}
+    
     def generate_chain_of_thought(self, queries):
         """Process multiple queries using chain of thought"""
-        results = {}
-        
-        for query in queries:
-            # Step 1: Web Search
-            web_result = self.web_search(query)
-            
-            # Step 2: LLM Analysis
-            chat_completion = self.groq_client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You are an expert at extracting precise information from web search results."},
-                    {"role": "user", "content": f"Analyze this web search result for the query '{query}': {web_result}. Extract the most relevant numerical information."}
-                ],
-                model="llama3-70b-8192"
-            )
-            
-            # Store result
-            results[query] = chat_completion.choices[0].message.content
-        
-        return results
+        # Each query is independent, so total time is the slowest query, not the sum
+        return asyncio.run(self._process_concurrently(queries))
     
     def process_queries(self, queries):
         """Main method to process multiple queries"""
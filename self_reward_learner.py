@@ -1,18 +1,54 @@
 import numpy as np
-import tensorflow as tf
-from memory_manager import memory_manager
-import time
+from memory_manager import get_memory_manager
+import tiktoken
 import threading
+import queue
+
+# TensorFlow is imported on first learner construction, not at module import
+tf = None
+
+def _import_tensorflow():
+    """Import TensorFlow and configure the global precision policy once"""
+    global tf
+    if tf is None:
+        import tensorflow
+        # Compute in bfloat16, keep variables in float32
+        tensorflow.keras.mixed_precision.set_global_policy('mixed_bfloat16')
+        tf = tensorflow
+    return tf
 
 class DeepSelfRewardLearner:
     def __init__(self, input_dim=100, hidden_layers=[128, 64], learning_rate=0.001):
+        _import_tensorflow()
+        
         # Define optimizer first
         self.optimizer = tf.keras.optimizers.Adam(learning_rate=learning_rate)
         self.loss_function = tf.keras.losses.MeanSquaredError()
         
+        # Tokenizer for the hashed bag-of-tokens features
+        self.input_dim = input_dim
+        self.tokenizer = tiktoken.get_encoding("cl100k_base")
+        
         # Then build the model
         self.model = self.build_model(input_dim, hidden_layers)
         
+        # Compiled training step, shared by single and batched training
+        self._train_step = tf.function(self._apply_gradients, reduce_retracing=True)
+        
+        # Compiled inference, avoiding model.predict's per-call setup
+        self._predict_fn = tf.function(
+            lambda x: self.model(x, training=False),
+            input_signature=[tf.TensorSpec([None, input_dim], tf.float32)]
+        )
+        
+        # Reusable input/target buffers; the batch dimension is left open so
+        # single conversations and batches share them
+        self._x_buf = tf.Variable(tf.zeros([1, input_dim], dtype=tf.float32), trainable=False,
+                                  shape=tf.TensorShape([None, input_dim]))
+        self._y_buf = tf.Variable(tf.zeros([1, 1], dtype=tf.float32), trainable=False,
+                                  shape=tf.TensorShape([None, 1]))
+        self._buf_lock = threading.Lock()
+        
         # Continuous learning thread
         self.start_continuous_learning()
     
@@ -25,58 +61,141 @@ class DeepSelfRewardLearner:
         ] + [
             tf.keras.layers.BatchNormalization(),
             tf.keras.layers.Dropout(0.2),
-            tf.keras.layers.Dense(1, activation='linear')
+            # Float32 output keeps the loss numerically stable
+            tf.keras.layers.Dense(1, activation='linear', dtype='float32')
         ])
         
         # Compile with the pre-defined optimizer
         model.compile(optimizer=self.optimizer, loss=self.loss_function)
         return model
     
+    def _conversation_text(self, conversation):
+        """Flatten a stored conversation entry into a single string"""
+        if isinstance(conversation, dict):
+            return f"{conversation.get('user_message', '')}\n{conversation.get('bot_response', '')}"
+        return str(conversation)
+    
+    def preprocess_batch(self, conversations):
+        """Convert conversations to hashed token-count vectors in one pass"""
+        token_lists = self.tokenizer.encode_batch(
+            [self._conversation_text(c) for c in conversations],
+            disallowed_special=()
+        )
+        
+        # Hashing trick: bucket token ids by modulo, count all rows with one bincount
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+        tokens = np.fromiter(
+            (token for token_list in token_lists for token in token_list),
+            dtype=np.int64, count=int(lengths.sum())
+        )
+        rows = np.repeat(np.arange(len(token_lists)), lengths)
+        counts = np.bincount(rows * self.input_dim + tokens % self.input_dim,
+                             minlength=len(token_lists) * self.input_dim)
+        return counts.reshape(len(token_lists), self.input_dim).astype(np.float32)
+    
     def preprocess_conversation(self, conversation):
         """Convert conversation to numerical representation"""
-        # Implement advanced feature extraction
-        # This is a placeholder - you'd want more sophisticated encoding
-        return np.random.rand(100)  # Random vector for demonstration
+        return self.preprocess_batch([conversation])[0]
     
     def calculate_reward(self, conversation):
         """Calculate self-reward based on conversation quality"""
         # Implement complex reward calculation logic
         # Consider factors like coherence, relevance, novelty
         input_vector = self.preprocess_conversation(conversation)
-        reward = self.model.predict(input_vector.reshape(1, -1))[0][0]
-        return reward
+        with self._buf_lock:
+            self._x_buf.assign(input_vector[None])
+            reward = self._predict_fn(self._x_buf)[0, 0]
+        return float(reward)
     
-    def train_on_conversation(self, conversation, target_reward=None):
-        """Train model on conversation data"""
-        input_vector = self.preprocess_conversation(conversation)
-        
-        if target_reward is None:
-            # Self-generated reward if not provided
-            target_reward = self.calculate_reward(conversation)
-        
+    def _apply_gradients(self, inputs, target_rewards):
+        """Run one optimization step on a batch of inputs"""
         with tf.GradientTape() as tape:
-            predicted_reward = self.model(input_vector.reshape(1, -1))
-            loss = self.loss_function(target_reward, predicted_reward)
+            predicted_rewards = self.model(inputs)
+            loss = self.loss_function(target_rewards, predicted_rewards)
         
         gradients = tape.gradient(loss, self.model.trainable_variables)
         self.optimizer.apply_gradients(zip(gradients, self.model.trainable_variables))
+        return loss
+    
+    def train_on_conversation(self, conversation, target_reward=None):
+        """Train model on conversation data"""
+        input_vector = self.preprocess_conversation(conversation)
+        
+        with self._buf_lock:
+            self._x_buf.assign(input_vector[None])
+            
+            if target_reward is None:
+                # Self-generated reward if not provided
+                target_reward = self._predict_fn(self._x_buf)[0, 0]
+            
+            self._y_buf.assign([[target_reward]])
+            loss = self._train_step(self._x_buf, self._y_buf)
         
         # Record learning event
-        memory_manager.record_learning_event('model_training', {
+        get_memory_manager().record_learning_event('model_training', {
             'loss': float(loss),
             'target_reward': float(target_reward)
         })
     
+    def train_on_batch(self, conversations, target_rewards=None):
+        """Train model on a batch of conversations with one forward pass and one update"""
+        if not conversations:
+            return
+        
+        inputs = self.preprocess_batch(conversations)
+        
+        with self._buf_lock:
+            self._x_buf.assign(inputs)
+            
+            if target_rewards is None:
+                # Self-generated rewards for the whole batch in a single prediction
+                target_rewards = self._predict_fn(self._x_buf).numpy()
+            target_rewards = np.asarray(target_rewards, dtype=np.float32).reshape(-1, 1)
+            
+            self._y_buf.assign(target_rewards)
+            loss = self._train_step(self._x_buf, self._y_buf)
+        
+        # Record one learning event per batch
+        get_memory_manager().record_learning_event('model_training', {
+            'loss': float(loss),
+            'batch_size': len(conversations),
+            'mean_target_reward': float(target_rewards.mean())
+        })
+    
+    def notify_conversation(self, conversation_id, conversation):
+        """Queue a newly recorded conversation and wake the learning thread"""
+        self._pending.put((conversation_id, conversation))
+        self._train_event.set()
+    
     def start_continuous_learning(self):
         """Start background thread for continuous learning"""
+        self._train_event = threading.Event()
+        self._pending = queue.Queue()
+        
+        # Learn from existing history once, then only from new conversations
+        memory_manager = get_memory_manager()
+        for conv_id, conversation in list(memory_manager.conversations.items()):
+            self._pending.put((conv_id, conversation))
+        if not self._pending.empty():
+            # Train on the backlog right away instead of after the first timeout
+            self._train_event.set()
+        memory_manager.add_conversation_listener(self.notify_conversation)
+        
         def learn_loop():
             while True:
-                # Create a copy of the conversations to iterate safely
-                conversations_copy = dict(memory_manager.conversations)
-                for conv_id, conversation in conversations_copy.items():
-                    self.train_on_conversation(conversation)
+                # Wake on new data, or at least every minute
+                self._train_event.wait(timeout=60)
+                self._train_event.clear()
+                
+                batch = []
+                while True:
+                    try:
+                        batch.append(self._pending.get_nowait()[1])
+                    except queue.Empty:
+                        break
                 
-                time.sleep(60)  # Learn every minute
+                if batch:
+                    self.train_on_batch(batch)
         
         learning_thread = threading.Thread(target=learn_loop, daemon=True)
         learning_thread.start()
@@ -87,5 +206,21 @@ class DeepSelfRewardLearner:
         # Could involve adding/removing layers, changing activation functions
         pass
 
-# Instantiate learner
-self_reward_learner = DeepSelfRewardLearner()
+# Lazily instantiated learner
+_learner = None
+_learner_lock = threading.Lock()
+
+def get_learner():
+    """Return the shared learner, instantiating it on first use"""
+    global _learner
+    if _learner is None:
+        with _learner_lock:
+            if _learner is None:
+                _learner = DeepSelfRewardLearner()
+    return _learner
+
+def __getattr__(name):
+    # Keeps `from self_reward_learner import self_reward_learner` working lazily
+    if name == 'self_reward_learner':
+        return get_learner()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
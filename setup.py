@@ -2,38 +2,32 @@ import subprocess
 import sys
 import os
 
+# SpaCy model wheel matching spacy==3.7.x in requirements.txt
+SPACY_MODEL_URL = 'https://github.com/explosion/spacy-models/releases/download/en_core_web_md-3.7.1/en_core_web_md-3.7.1-py3-none-any.whl'
+
 def install_dependencies():
     """
-    Install project dependencies from requirements.txt
+    Upgrade pip, then install project dependencies from requirements.txt and
+    the SpaCy model in a single pip invocation
     """
     try:
-        # Upgrade pip to the latest version
+        # pip cannot replace itself in the same run on Windows
         subprocess.check_call([sys.executable, '-m', 'pip', 'install', '--upgrade', 'pip'])
-        
-        # Install requirements
-        subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'])
-        print("Successfully installed dependencies from requirements.txt")
+        subprocess.check_call([
+            sys.executable, '-m', 'pip', 'install',
+            '-r', 'requirements.txt',
+            SPACY_MODEL_URL
+        ])
+        print("Successfully installed dependencies from requirements.txt and SpaCy model en_core_web_md")
     except subprocess.CalledProcessError as e:
         print(f"Error installing dependencies: {e}")
         sys.exit(1)
 
-def download_spacy_model():
-    """
-    Download the specified SpaCy language model
-    """
-    try:
-        subprocess.check_call([sys.executable, '-m', 'spacy', 'download', 'en_core_web_md'])
-        print("Successfully downloaded SpaCy model en_core_web_md")
-    except subprocess.CalledProcessError as e:
-        print(f"Error downloading SpaCy model: {e}")
-        sys.exit(1)
-
 def main():
     """
     Main setup function to install dependencies and download models
     """
     install_dependencies()
-    download_spacy_model()
 
 if __name__ == '__main__':
     main()
@@ -1,20 +1,162 @@
-import requests
+import aiohttp
+import asyncio
 import random
-import json
+import orjson
+import hashlib
+import diskcache
 import os
+import io
+import argparse
+import itertools
+import atexit
 import sys
 import time
 import logging
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+import queue
+import threading
 import re
+import codecs
+import functools
 import socket
 import ipaddress
+from dataclasses import dataclass
 from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
-import urllib.parse
+from bs4 import BeautifulSoup, SoupStrainer
 import subprocess
 import change_dns
 
+logger = logging.getLogger('AdvancedWebSearcher')
+
+# Optional c-ares resolver for aiohttp; falls back to dnspython, then to the
+# threaded system resolver
+try:
+    import aiodns
+    from aiohttp.resolver import AsyncResolver
+except ImportError:
+    aiodns = None
+
+try:
+    import dns.asyncresolver
+    import dns.exception
+    from aiohttp.abc import AbstractResolver
+except ImportError:
+    dns = None
+
+# Seconds a resolved host stays in the connector's DNS cache
+DNS_CACHE_TTL = 900
+
+# Seconds a replaced session stays open so in-flight requests can finish
+RETIRED_SESSION_GRACE = 10
+
+# Append-only NDJSON log of saved searches, one object per line
+SEARCH_LOG_FILENAME = 'search_log.ndjson'
+
+# Optional Zstandard compression of the search log with a trained dictionary
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+ZSTD_DICT_FILENAME = '.zstd_dict'
+ZSTD_DICT_SIZE = 8192
+ZSTD_DICT_SAMPLES = 1000
+
+# Seconds search results stay in the on-disk response cache
+SEARCH_CACHE_TTL = 3600
+
+# Retries for throttled or failed searches, backing off 0.3s, 0.6s, ...
+SEARCH_RETRIES = 2
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = frozenset({202, 502, 503, 504})
+
+# Seconds to wait for a connection before treating DNS/connectivity as broken
+CONNECT_TIMEOUT = 3
+
+if dns is not None:
+    class NameserverResolver(AbstractResolver):
+        """aiohttp resolver querying the given nameservers through dnspython"""
+        
+        def __init__(self, nameservers: List[str]):
+            self._resolver = dns.asyncresolver.Resolver(configure=False)
+            self._resolver.nameservers = list(nameservers)
+            self._resolver.lifetime = CONNECT_TIMEOUT
+        
+        async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET) -> List[Dict]:
+            # Unspecified families resolve to IPv4; the connector handles IP literals
+            family = socket.AF_INET6 if family == socket.AF_INET6 else socket.AF_INET
+            try:
+                answer = await self._resolver.resolve(host, 'AAAA' if family == socket.AF_INET6 else 'A')
+            except dns.exception.DNSException as e:
+                raise OSError(f"DNS lookup failed for {host}: {e}") from e
+            
+            return [{
+                'hostname': host,
+                'host': record.address,
+                'port': port,
+                'family': family,
+                'proto': 0,
+                'flags': socket.AI_NUMERICHOST
+            } for record in answer]
+        
+        async def close(self) -> None:
+            pass
+
+# Prefer the Lexbor-backed selectolax parser for result extraction
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# Start of each result block; pages are sliced here so parsers only see results
+RESULT_BLOCK_RE = re.compile(rb'<div\b[^>]*\bclass="[^"]*\bresult__body\b')
+
+# Otherwise extract with precompiled lxml XPath, or BeautifulSoup as a last resort
+try:
+    from lxml import etree, html as lxml_html
+    
+    def _class_xpath(tag, css_class):
+        return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]"
+    
+    RESULT_XPATH = etree.XPath(f"//{_class_xpath('div', 'result__body')}")
+    TITLE_XPATH = etree.XPath(f".//{_class_xpath('h2', 'result__title')}[1]")
+    LINK_XPATH = etree.XPath(f".//{_class_xpath('a', 'result__url')}[1]")
+    SNIPPET_XPATH = etree.XPath(f".//{_class_xpath('a', 'result__snippet')}[1]")
+    
+    @functools.lru_cache(maxsize=None)
+    def _lxml_parser(encoding):
+        # Page fragments lose the <meta charset>, so the encoding is explicit
+        return lxml_html.HTMLParser(encoding=encoding)
+except ImportError:
+    lxml_html = None
+
+# Limits the BeautifulSoup fallback to building result blocks only; the class
+# attribute is still the raw string here, so match the class as a whole word
+RESULT_STRAINER = SoupStrainer('div', class_=re.compile(r'(?:^|\s)result__body(?:\s|$)'))
+
+@dataclass(frozen=True)
+class SearchResult:
+    """A single search result"""
+    __slots__ = ('title', 'link', 'snippet')
+    
+    title: str
+    link: str
+    snippet: str
+    
+    def __reduce__(self):
+        # Frozen slotted instances cannot be unpickled through setattr
+        return (SearchResult, (self.title, self.link, self.snippet))
+
 class AdvancedWebSearcher:
+    # Fixed attribute set; no per-instance __dict__
+    __slots__ = (
+        'dns_servers', 'results_dir', '_results_queue', '_results_writer',
+        '_search_log', '_export_counter', 'search_interval', 'max_queue_size',
+        '_result_cache', '_disk_cache', 'user_agents', '_headers_pool',
+        '_headers_count', 'default_topics', '_session', '_session_loop',
+        '_nameservers', '_log_listener'
+    )
+    
     def __init__(self, 
                  log_file='advanced_web_search.log', 
                  results_dir='comprehensive_search_results',
@@ -25,18 +167,41 @@ class AdvancedWebSearcher:
         """
         self.dns_servers = change_dns.DNS_SERVERS
         self.setup_logging(log_file)
+        if aiodns is None:
+            if dns is None:
+                logger.warning("aiodns and dnspython not found. Falling back to the system DNS resolver.")
+            else:
+                logger.warning("aiodns not found. Falling back to the dnspython resolver.")
         self.results_dir = results_dir
+        
+        # Result files are written by a background thread fed from this queue
+        self._results_queue = queue.Queue()
+        self._results_writer = None
+        self._search_log = None
+        # Per-process sequence keeping exported file names unique
+        self._export_counter = itertools.count()
         os.makedirs(results_dir, exist_ok=True)
         self.search_interval = search_interval
         self.max_queue_size = max_queue_size
         
+        # Recent results keyed by (normalized query, max_results); entries expire
+        # after search_interval seconds and at most max_queue_size are kept
+        self._result_cache: Dict[tuple, tuple] = {}
+        
+        # Longer-lived on-disk cache shared across runs
+        self._disk_cache = diskcache.Cache(os.path.join(results_dir, '.httpcache'))
+        
         # User-Agent rotation
-        self.user_agents = [
+        self.user_agents = (
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        ]
+        )
+        
+        # Per-request header dicts, built once; shared headers are session defaults
+        self._headers_pool = tuple({'User-Agent': user_agent} for user_agent in self.user_agents)
+        self._headers_count = len(self._headers_pool)
         
         # Predefined search topics
         self.default_topics = [
@@ -46,19 +211,87 @@ class AdvancedWebSearcher:
             "machine learning breakthroughs",
             "renewable energy innovations"
         ]
+        
+        # Shared HTTP session, created lazily inside the running event loop
+        self._session = None
+        self._session_loop = None
+        self._nameservers = self.dns_servers
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session for the current event loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            if aiodns is not None:
+                resolver = AsyncResolver(nameservers=self._nameservers)
+            elif dns is not None:
+                resolver = NameserverResolver(self._nameservers)
+            else:
+                resolver = None
+            self._session = aiohttp.ClientSession(
+                headers={'Accept-Language': 'en-US,en;q=0.9'},
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=20,
+                    resolver=resolver,
+                    use_dns_cache=True,
+                    ttl_dns_cache=DNS_CACHE_TTL
+                ),
+                timeout=aiohttp.ClientTimeout(total=10, connect=CONNECT_TIMEOUT)
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._disk_cache.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
 
     def setup_logging(self, log_file: str):
-        """Configure logging with console output"""
-        logging.basicConfig(
-            level=logging.INFO, 
-            format='%(asctime)s - %(levelname)s: %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler(sys.stdout)  # Add console output
-            ]
-        )
+        """
+        Configure logging with console output
+        
+        Records are queued and written to the file and console by a background
+        listener thread, so logging never blocks the caller on I/O. File output
+        is buffered and written in batches, immediately for errors.
+        """
+        # Searcher instances share the module logger and its listener
+        self._log_listener = None
+        if any(isinstance(handler, QueueHandler) for handler in logger.handlers):
+            return
 
-    def duckduckgo_search(self, query: str, max_results: int = 5) -> List[Dict]:
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s: %(message)s')
+        file_handler = logging.FileHandler(log_file, delay=True)
+        stream_handler = logging.StreamHandler(sys.stdout)  # Add console output
+        file_handler.setFormatter(formatter)
+        stream_handler.setFormatter(formatter)
+        buffered_file_handler = MemoryHandler(512, flushLevel=logging.ERROR, target=file_handler)
+        
+        log_queue = queue.Queue(-1)
+        queue_handler = QueueHandler(log_queue)
+        # Records are formatted once, by the listener's handlers
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        
+        # Attached to the module logger rather than root, which change_dns
+        # configures at import
+        logger.setLevel(logging.INFO)
+        logger.addHandler(queue_handler)
+        logger.propagate = False
+        
+        self._log_listener = QueueListener(log_queue, buffered_file_handler, stream_handler, respect_handler_level=True)
+        self._log_listener.start()
+        # atexit runs in reverse: stop the listener, then flush the buffer
+        atexit.register(buffered_file_handler.close)
+        atexit.register(self._log_listener.stop)
+
+    async def duckduckgo_search(self, query: str, max_results: int = 5) -> List[SearchResult]:
         """
         Perform web search using DuckDuckGo with adaptive DNS handling
         """
@@ -66,48 +299,172 @@ class AdvancedWebSearcher:
         
         try:
             # DuckDuckGo search URL
-            search_url = f"https://duckduckgo.com/html/?q={urllib.parse.quote(query)}"
-            
-            # Headers to mimic browser request
-            headers = {
-                'User-Agent': random.choice(self.user_agents),
-                'Accept-Language': 'en-US,en;q=0.9',
-            }
+            search_url = "https://duckduckgo.com/html/"
+            params = {'q': query}
             
-            # Perform search request
-            response = requests.get(search_url, headers=headers, timeout=10)
+            # Rotate the User-Agent per request
+            headers = self._headers_pool[random.randrange(self._headers_count)]
             
-            # Check for DNS or connection issues (202 error)
-            if response.status_code == 202:
-                print("⚠️ DNS Resolution Issue Detected. Changing DNS...")
-                self.adaptive_dns_change()
-                # Retry search after DNS change
-                response = requests.get(search_url, headers=headers, timeout=10)
+            # Perform search request, retrying throttled responses with backoff
+            for attempt in range(SEARCH_RETRIES + 1):
+                retry = attempt < SEARCH_RETRIES
+                try:
+                    async with self._get_session().get(search_url, params=params, headers=headers) as response:
+                        status = response.status
+                        html = await response.read()
+                        charset = response.charset
+                except (aiohttp.ClientConnectorError, aiohttp.ServerTimeoutError):
+                    if not retry:
+                        raise
+                    # Only a failed connect points at DNS; switch before retrying
+                    print("⚠️ DNS Resolution Issue Detected. Changing DNS...")
+                    await self.switch_dns()
+                    continue
+                
+                if status not in RETRY_STATUSES or not retry:
+                    break
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
             
-            # Parse search results
-            soup = BeautifulSoup(response.text, 'html.parser')
-            results = []
+            # Unknown or missing charsets fall back to UTF-8, which DuckDuckGo serves
+            try:
+                encoding = codecs.lookup(charset or 'utf-8').name
+            except LookupError:
+                encoding = 'utf-8'
             
-            # Extract search results
-            for result in soup.find_all('div', class_='result__body')[:max_results]:
-                title_elem = result.find('h2', class_='result__title')
-                link_elem = result.find('a', class_='result__url')
-                snippet_elem = result.find('a', class_='result__snippet')
-                
-                if title_elem and link_elem and snippet_elem:
-                    results.append({
-                        'title': title_elem.get_text(strip=True),
-                        'link': link_elem.get('href', ''),
-                        'snippet': snippet_elem.get_text(strip=True)
-                    })
+            # Parse search results off the event loop
+            results = await asyncio.to_thread(self.parse_search_results, html, max_results, encoding)
             
             print(f"✅ Found {len(results)} search results")
             return results
         
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             print(f"❌ Search Error: {e}")
             return []
 
+    def parse_search_results(self, html: bytes, max_results: int = 5,
+                             encoding: str = 'utf-8') -> List[SearchResult]:
+        """
+        Extract title, link and snippet from a DuckDuckGo HTML results page
+        
+        :param html: Raw results page bytes
+        :param max_results: Maximum number of results to extract
+        :param encoding: Normalised codec name of the page encoding, from the response charset
+        :return: List of search results
+        """
+        # Keyed by link: duplicates keep their first occurrence, in page order
+        results = {}
+        
+        for title, link, snippet in self._iter_result_fields(html, encoding):
+            if link in results:
+                continue
+            
+            results[link] = SearchResult(title, link, snippet)
+            if len(results) >= max_results:
+                break
+        
+        return list(results.values())
+
+    def _iter_result_fields(self, html: bytes, encoding: str = 'utf-8'):
+        """
+        Yield (title, link, snippet) for each complete result block on the page
+        
+        The page is cut into one slice per result block and the slices are
+        parsed lazily, so a caller that stops early never parses the rest.
+        Pages without recognisable blocks are parsed whole.
+        """
+        starts = [match.start() for match in RESULT_BLOCK_RE.finditer(html)]
+        if not starts:
+            yield from self._iter_block_fields(html, encoding)
+            return
+        
+        for start, end in zip(starts, starts[1:] + [len(html)]):
+            yield from self._iter_block_fields(html[start:end], encoding)
+
+    def _iter_block_fields(self, html: bytes, encoding: str = 'utf-8'):
+        """
+        Yield (title, link, snippet) for each complete result block in an HTML fragment
+        
+        Element text is concatenated as-is and stripped once at the ends, the
+        same on every parser, so whitespace between inline tags is kept.
+        Fragments carry no <meta charset>, so the encoding is passed explicitly.
+        """
+        if not html.strip():
+            # lxml refuses to parse an empty document
+            return
+        
+        if LexborHTMLParser is not None:
+            # Lexbor reads bytes as UTF-8; other charsets are decoded first
+            if encoding != 'utf-8':
+                html = html.decode(encoding, 'replace')
+            for result in LexborHTMLParser(html).css('div.result__body'):
+                title_elem = result.css_first('h2.result__title')
+                link_elem = result.css_first('a.result__url')
+                snippet_elem = result.css_first('a.result__snippet')
+                
+                if title_elem and link_elem and snippet_elem:
+                    yield (
+                        title_elem.text().strip(),
+                        link_elem.attributes.get('href') or '',
+                        snippet_elem.text().strip()
+                    )
+            return
+        
+        if lxml_html is not None:
+            for result in RESULT_XPATH(lxml_html.fromstring(html, parser=_lxml_parser(encoding))):
+                title_elem = TITLE_XPATH(result)
+                link_elem = LINK_XPATH(result)
+                snippet_elem = SNIPPET_XPATH(result)
+                
+                if title_elem and link_elem and snippet_elem:
+                    yield (
+                        title_elem[0].text_content().strip(),
+                        link_elem[0].get('href', ''),
+                        snippet_elem[0].text_content().strip()
+                    )
+            return
+        
+        soup = BeautifulSoup(html, 'html.parser', parse_only=RESULT_STRAINER, from_encoding=encoding)
+        for result in soup.find_all('div', recursive=False):
+            title_elem = result.select_one('h2.result__title')
+            link_elem = result.select_one('a.result__url')
+            snippet_elem = result.select_one('a.result__snippet')
+            
+            if title_elem and link_elem and snippet_elem:
+                yield (
+                    title_elem.get_text().strip(),
+                    link_elem.get('href', ''),
+                    snippet_elem.get_text().strip()
+                )
+
+    async def switch_dns(self) -> bool:
+        """
+        Resolve through a different DNS server for subsequent requests
+        
+        With aiodns or dnspython available only this searcher's resolver
+        changes: the session is rebuilt around a new nameserver and the system
+        DNS is left alone. Otherwise falls back to changing the system DNS.
+        
+        :return: Whether the DNS server was changed
+        """
+        if aiodns is None and dns is None:
+            changed = await asyncio.to_thread(self.adaptive_dns_change)
+            if self._session is not None:
+                # Drop cached addresses so the retry resolves afresh
+                self._session.connector.clear_dns_cache()
+            return changed
+        
+        new_dns = random.choice(self.dns_servers)
+        print(f"🌐 Selected DNS Server: {new_dns}")
+        self._nameservers = [new_dns]
+        
+        # Retire the current session once requests already using it are done
+        retired, self._session = self._session, None
+        if retired is not None and not retired.closed:
+            asyncio.get_running_loop().call_later(
+                RETIRED_SESSION_GRACE, lambda: asyncio.ensure_future(retired.close())
+            )
+        return True
+
     def adaptive_dns_change(self):
         """
         Dynamically change DNS when connection issues are detected
@@ -122,9 +479,6 @@ class AdvancedWebSearcher:
             # Use change_dns script to modify DNS
             if change_dns.change_dns_without_admin([new_dns]):
                 print(f"✅ DNS Successfully Changed to {new_dns}")
-                
-                # Optional: Small delay to allow DNS propagation
-                time.sleep(2)
                 return True
             else:
                 print("❌ Failed to Change DNS")
@@ -134,42 +488,206 @@ class AdvancedWebSearcher:
             print(f"❌ DNS Change Error: {e}")
             return False
 
-    def web_search(self, query: str, max_results: int = 5) -> Optional[List[Dict]]:
+    async def web_search(self, query: str, max_results: int = 5) -> Optional[List[SearchResult]]:
         """
         Perform web search with DuckDuckGo and adaptive DNS handling
         """
         print(f"🔍 Initiating Web Search for: {query}")
-        return self.duckduckgo_search(query, max_results)
+        
+        # Serve a fresh result for the same query without another round trip
+        cache_key = (' '.join(query.lower().split()), max_results)
+        cached = self._result_cache.get(cache_key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        
+        # The record type is part of the key so entries pickled in another shape are not served
+        disk_key = hashlib.blake2b(
+            f"{SearchResult.__name__}|{cache_key[0]}|{max_results}".encode('utf-8'), digest_size=16
+        ).hexdigest()
+        results = await asyncio.to_thread(self._disk_cache.get, disk_key)
+        if results is None:
+            results = await self.duckduckgo_search(query, max_results)
+            if results:
+                await asyncio.to_thread(self._disk_cache.set, disk_key, results, expire=SEARCH_CACHE_TTL)
+        
+        if results:
+            self._result_cache.pop(cache_key, None)
+            self._result_cache[cache_key] = (time.monotonic() + self.search_interval, results)
+            if len(self._result_cache) > self.max_queue_size:
+                # Oldest insertion first
+                del self._result_cache[next(iter(self._result_cache))]
+        return results
 
-    def save_search_results(self, query: str, results: List[Dict]) -> Optional[str]:
+    async def search_many(self, queries: List[str], max_results: int = 5,
+                          max_concurrency: int = 8) -> List[List[SearchResult]]:
+        """
+        Run several web searches concurrently over the shared session
+        
+        :param queries: Search queries
+        :param max_results: Maximum results per query
+        :param max_concurrency: Maximum number of searches in flight at once
+        :return: Result lists in the same order as the queries
         """
-        Save search results to a timestamped JSON file
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def bounded_search(query):
+            async with semaphore:
+                return await self.web_search(query, max_results)
+        
+        return await asyncio.gather(*(bounded_search(query) for query in queries))
+
+    async def prefetch_defaults(self, max_results: int = 5):
+        """
+        Warm the result caches with the predefined search topics
+        
+        :param max_results: Maximum results per topic, matching later lookups
+        """
+        await self.search_many(self.default_topics, max_results, max_concurrency=2)
+
+    def save_search_results(self, query: str, results: List[SearchResult]) -> Optional[str]:
+        """
+        Append search results to the NDJSON search log
+        
+        The line is written by a background thread; the path is returned
+        immediately. Once a dictionary has been trained with
+        train_results_dictionary, new lines go to a Zstandard-compressed log.
         
         :param query: Original search query
         :param results: Search results to save
-        :return: Path to saved results file
+        :return: Path of the search log
         """
         try:
-            timestamp = int(time.time())
-            filename = os.path.join(
-                self.results_dir, 
-                f"search_results_{timestamp}.json"
-            )
+            if self._results_writer is None:
+                self._start_results_writer()
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'query': query,
-                    'timestamp': timestamp,
-                    'results': results
-                }, f, ensure_ascii=False, indent=4)
-            
-            logging.info(f"Search results saved to {filename}")
-            return filename
+            self._results_queue.put({
+                'query': query,
+                'timestamp': int(time.time()),
+                'results': results
+            })
+            return self._search_log
         
         except Exception as e:
-            logging.error(f"Error saving search results: {e}")
+            logger.error(f"Error saving search results: {e}")
+            return None
+
+    def _load_zstd_dict(self):
+        """Return the trained Zstandard dictionary, or None if unavailable"""
+        if zstd is None:
+            return None
+        try:
+            with open(os.path.join(self.results_dir, ZSTD_DICT_FILENAME), 'rb') as f:
+                return zstd.ZstdCompressionDict(f.read())
+        except FileNotFoundError:
             return None
 
+    def _start_results_writer(self):
+        """Start the background thread that appends queued results to the search log"""
+        filename = os.path.join(self.results_dir, SEARCH_LOG_FILENAME)
+        compressor = None
+        zstd_dict = self._load_zstd_dict()
+        if zstd_dict is not None:
+            # One dictionary-compressed frame per line; frames concatenate
+            filename += '.zst'
+            compressor = zstd.ZstdCompressor(level=3, dict_data=zstd_dict)
+        self._search_log = filename
+        
+        def write_results():
+            with open(filename, 'ab', buffering=1 << 20) as f:
+                while True:
+                    payload = self._results_queue.get()
+                    if payload is None:
+                        break
+                    
+                    try:
+                        line = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS) + b'\n'
+                        f.write(compressor.compress(line) if compressor is not None else line)
+                        # Flush once the backlog is drained rather than per line
+                        if self._results_queue.empty():
+                            f.flush()
+                        logger.info(f"Search results saved to {filename}")
+                    except Exception as e:
+                        logger.error(f"Error saving search results: {e}")
+        
+        def stop_results_writer():
+            # Drain pending writes before the interpreter exits
+            self._results_queue.put(None)
+            self._results_writer.join()
+        
+        self._results_writer = threading.Thread(target=write_results, daemon=True)
+        self._results_writer.start()
+        atexit.register(stop_results_writer)
+
+    def export_to_json(self, timestamp: int) -> Optional[str]:
+        """
+        Write the search log entries saved at a given timestamp to an indented JSON file
+        
+        :param timestamp: Save timestamp, in seconds, to export
+        :return: Path of the exported file, or None if nothing matched
+        """
+        try:
+            entries = [entry for entry in self._iter_search_log() if entry['timestamp'] == timestamp]
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.error(f"Error reading search log: {e}")
+            return None
+        
+        if not entries:
+            return None
+        
+        filename = os.path.join(
+            self.results_dir,
+            f"search_results_{timestamp}_{os.getpid()}_{next(self._export_counter)}.json"
+        )
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(entries, option=orjson.OPT_INDENT_2))
+        return filename
+
+    def _iter_search_log(self):
+        """Yield saved search entries from the plain and compressed search logs"""
+        path = os.path.join(self.results_dir, SEARCH_LOG_FILENAME)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                for line in f:
+                    yield orjson.loads(line)
+        
+        zstd_dict = self._load_zstd_dict()
+        if zstd_dict is not None and os.path.exists(path + '.zst'):
+            decompressor = zstd.ZstdDecompressor(dict_data=zstd_dict)
+            with open(path + '.zst', 'rb') as f:
+                reader = io.BufferedReader(decompressor.stream_reader(f, read_across_frames=True))
+                for line in reader:
+                    yield orjson.loads(line)
+
+    def train_results_dictionary(self) -> Optional[str]:
+        """
+        Train a Zstandard dictionary on saved search log lines
+        
+        Searcher instances started afterwards write a compressed log with it.
+        
+        :return: Path of the dictionary file, or None if training was not possible
+        """
+        if zstd is None:
+            logger.error("zstandard not found. Cannot train a search log dictionary.")
+            return None
+        
+        samples = []
+        try:
+            with open(os.path.join(self.results_dir, SEARCH_LOG_FILENAME), 'rb') as f:
+                for line in f:
+                    samples.append(line)
+                    if len(samples) >= ZSTD_DICT_SAMPLES:
+                        break
+            zstd_dict = zstd.train_dictionary(ZSTD_DICT_SIZE, samples)
+        except (OSError, zstd.ZstdError) as e:
+            logger.error(f"Error training search log dictionary: {e}")
+            return None
+        
+        filename = os.path.join(self.results_dir, ZSTD_DICT_FILENAME)
+        with open(filename, 'wb') as f:
+            f.write(zstd_dict.as_bytes())
+        logger.info(f"Search log dictionary saved to {filename}")
+        return filename
+
     @classmethod
     def run_as_admin(cls):
         """
@@ -193,33 +711,64 @@ class AdvancedWebSearcher:
                 subprocess.run(['sudo', sys.executable] + sys.argv)
                 sys.exit(0)
         except Exception as e:
-            logging.error(f"Could not elevate privileges: {e}")
+            logger.error(f"Could not elevate privileges: {e}")
             return False
 
-def main():
-    """Test the web search functionality"""
-    searcher = AdvancedWebSearcher()
+async def _read_input(prompt: str) -> str:
+    """
+    Read a line of input without blocking the event loop
+    
+    A daemon thread is used rather than the default executor, so a pending
+    read never holds up interpreter shutdown after Ctrl-C.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def deliver(setter, value):
+        if not future.done():
+            setter(value)
+    
+    def read():
+        try:
+            line = input(prompt)
+        except BaseException as e:
+            loop.call_soon_threadsafe(deliver, future.set_exception, e)
+        else:
+            loop.call_soon_threadsafe(deliver, future.set_result, line)
+    
+    threading.Thread(target=read, daemon=True).start()
+    return await future
+
+async def _run_searches(searcher: AdvancedWebSearcher):
+    """Run the test queries, then the interactive search loop"""
     test_queries = [
         "latest AI technologies",
         "global technology trends",
         "machine learning breakthroughs"
     ]
     
-    for query in test_queries:
-        results = searcher.web_search(query)
+    # The shared HTTP session is closed however the loop ends
+    async with searcher:
+        await searcher.search_many(test_queries)
         print("\n" + "="*50)
+        
+        # Empty queries pick a default topic; fetch those while the user types
+        prefetch = asyncio.create_task(searcher.prefetch_defaults())
+        
+        try:
+            await _search_loop(searcher)
+        finally:
+            # Let the prefetch unwind before the session closes, also on Ctrl-C
+            prefetch.cancel()
+            await asyncio.gather(prefetch, return_exceptions=True)
 
-    # Initialize advanced web searcher
-    searcher = AdvancedWebSearcher()
-    
-    # Ensure admin privileges
-    # searcher.run_as_admin()
-    
+async def _search_loop(searcher: AdvancedWebSearcher):
+    """Interactive search loop; Ctrl-C cancels it from asyncio.run"""
     # Continuous search loop
     while True:
         try:
             # Get user input or use default topics
-            query = input("Enter search query (or 'quit' to exit): ").strip()
+            query = (await _read_input("Enter search query (or 'quit' to exit): ")).strip()
             
             if query.lower() == 'quit':
                 break
@@ -228,15 +777,15 @@ def main():
                 query = random.choice(searcher.default_topics)
             
             # Perform web search
-            results = searcher.web_search(query)
+            results = await searcher.web_search(query)
             
             if results:
                 # Display and save results
                 print("\nSearch Results:")
                 for i, result in enumerate(results, 1):
-                    print(f"\n{i}. {result['title']}")
-                    print(f"   Link: {result['link']}")
-                    print(f"   Snippet: {result['snippet']}")
+                    print(f"\n{i}. {result.title}")
+                    print(f"   Link: {result.link}")
+                    print(f"   Snippet: {result.snippet}")
                 
                 # Save results
                 saved_file = searcher.save_search_results(query, results)
@@ -244,11 +793,58 @@ def main():
             else:
                 print("No results found.")
         
-        except KeyboardInterrupt:
-            print("\nSearch interrupted.")
+        except EOFError:
+            # End of input (Ctrl-D / Ctrl-Z) ends the session like 'quit'
             break
         except Exception as e:
-            logging.error(f"Unexpected error: {e}")
+            logger.error(f"Unexpected error: {e}")
+
+def setup_query_history(history_file: str = os.path.expanduser('~/.web_search_history')):
+    """Enable readline line editing with query history persisted across runs"""
+    try:
+        import readline
+    except ImportError:
+        # readline is not available on Windows
+        return
+    
+    try:
+        readline.read_history_file(history_file)
+    except (FileNotFoundError, OSError):
+        pass
+    readline.set_history_length(1000)
+    atexit.register(readline.write_history_file, history_file)
+
+def main():
+    """Test the web search functionality"""
+    parser = argparse.ArgumentParser(description="Advanced DuckDuckGo web search")
+    parser.add_argument('--train-dict', action='store_true',
+                        help="train a Zstandard dictionary on the saved search log and exit")
+    parser.add_argument('--export', type=int, metavar='TIMESTAMP',
+                        help="export searches saved at TIMESTAMP to an indented JSON file and exit")
+    args = parser.parse_args()
+    
+    # Initialize advanced web searcher
+    searcher = AdvancedWebSearcher()
+    
+    if args.train_dict:
+        searcher.train_results_dictionary()
+        return
+    
+    if args.export is not None:
+        filename = searcher.export_to_json(args.export)
+        print(f"Results exported to {filename}" if filename else f"No searches saved at {args.export}")
+        return
+    
+    setup_query_history()
+    
+    # Ensure admin privileges
+    # searcher.run_as_admin()
+    
+    try:
+        asyncio.run(_run_searches(searcher))
+    except KeyboardInterrupt:
+        # asyncio.run cancels the searches, which closes the session, then re-raises here
+        print("\nSearch interrupted.")
 
 if __name__ == '__main__':
     main()